@@ -3,8 +3,27 @@ import platform
 import socket
 import time
 import logging
+import os
+import io
+import sys
+import re
+import threading
+import bisect
+from array import array
+from collections import namedtuple
 from datetime import datetime
 
+# modul bersama antar tool (proc_file, ...) ada di folder Monitor Tools
+SHARED_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+from proc_file import ProcFile
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def get_size(bytes, suffix="B"):
 
     factor = 1024
@@ -13,126 +32,741 @@ def get_size(bytes, suffix="B"):
             return f"{bytes:.2f}{unit}{suffix}"
         bytes /= factor
 
-def get_gpu_info():
+class GpuInfoProvider:
+    PCI_VENDORS = {
+        '0x10de': 'NVIDIA',
+        '0x1002': 'AMD',
+        '0x8086': 'Intel',
+        '0x1af4': 'Virtio',
+        '0x15ad': 'VMware',
+        '0x1234': 'QEMU',
+    }
 
-    try:
-        # Metode 1: Coba import GPUtil
+    def __init__(self, refresh_interval=5.0, sysfs_root='/sys', system=None):
+
+        self.refresh_interval = refresh_interval
+        self.sysfs_root = sysfs_root
+        self.system = system or platform.system()
+
+        # backend dan identitas GPU ditentukan sekali saat start
+        self.backend, self.devices = self._detect()
+        self.status = {}
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.error = None
+
+    def _detect(self):
+
+        # Metode 1: GPUtil (NVIDIA)
         try:
             import GPUtil
             gpus = GPUtil.getGPUs()
             if gpus:
-                return f"GPU: {gpus[0].name}, Utilization: {gpus[0].load * 100:.2f}%"
-        except ImportError:
+                return 'gputil', [{'name': gpu.name, 'memory_total': gpu.memoryTotal * 1024 * 1024} for gpu in gpus]
+        except Exception:
             pass
 
-        # Metode 2: memakai WMI for Windows
+        # Metode 2: sysfs DRM untuk Linux, tanpa subprocess
+        if self.system == 'Linux':
+            devices = self._scan_drm()
+            if devices:
+                return 'sysfs', devices
+
+        # Metode 3: WMI untuk Windows
+        if self.system == 'Windows':
+            try:
+                import wmi
+                controllers = wmi.WMI().Win32_VideoController()
+                if controllers:
+                    return 'wmi', [
+                        {'name': c.Name, 'memory_total': int(c.AdapterRAM or 0)} for c in controllers
+                    ]
+            except Exception:
+                pass
+
+        return 'none', []
+
+    def _read_sysfs(self, path):
+
         try:
-            import _wmi
-            c = _wmi.WMI()
-            gpu_info = c.Win32_VideoController()[0]
-            return f"GPU: {gpu_info.Name}, Memory: {get_size(gpu_info.AdapterRAM)}"
-        except ImportError:
-            pass
+            with open(path, 'r') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _scan_drm(self):
 
-        # Metode 3: menggunakn subproces for informasi GPU
+        drm_path = os.path.join(self.sysfs_root, 'class', 'drm')
         try:
-            import subprocess
-            
-            # untuk Windows
-            if platform.system() == "Windows":
-                try:
-                    output = subprocess.check_output(["wmic", "path", "win32_VideoController", "get", "name"], universal_newlines=True)
-                    return f"GPU: {output.strip().split('\\n')[1]}"
-                except:
-                    pass
-            
-            # untuk Linux
-            elif platform.system() == "Linux":
-                try:
-                    output = subprocess.check_output(["lspci", "-vnn", "|", "grep", "VGA"], universal_newlines=True)
-                    return f"GPU: {output.strip()}"
-                except:
-                    pass
-        except:
-            pass
+            entries = sorted(os.listdir(drm_path))
+        except OSError:
+            return []
+
+        devices = []
+        for entry in entries:
+            # hanya cardN, bukan konektor seperti card0-HDMI-A-1
+            if not re.fullmatch(r'card\d+', entry):
+                continue
+            device_path = os.path.join(drm_path, entry, 'device')
+            vendor_id = self._read_sysfs(os.path.join(device_path, 'vendor'))
+            if vendor_id is None:
+                continue
 
-        return "GPU: Informasi tidak tersedia"
+            uevent = {}
+            for line in (self._read_sysfs(os.path.join(device_path, 'uevent')) or '').splitlines():
+                key, _, value = line.partition('=')
+                uevent[key] = value
 
+            device_id = self._read_sysfs(os.path.join(device_path, 'device')) or '?'
+            vendor = self.PCI_VENDORS.get(vendor_id, vendor_id)
+            driver = uevent.get('DRIVER', 'unknown')
+            vram_total = self._read_sysfs(os.path.join(device_path, 'mem_info_vram_total'))
+            devices.append({
+                'name': f"{vendor} {device_id} ({driver})",
+                'card': entry,
+                'pci_slot': uevent.get('PCI_SLOT_NAME'),
+                'memory_total': int(vram_total) if vram_total and vram_total.isdigit() else None,
+                'busy_path': os.path.join(device_path, 'gpu_busy_percent'),
+                'vram_used_path': os.path.join(device_path, 'mem_info_vram_used'),
+            })
+        return devices
+
+    def refresh(self):
+
+        # hanya data dinamis (utilisasi, memori terpakai) yang dibaca ulang
+        status = {}
+        if self.backend == 'gputil':
+            import GPUtil
+            for index, gpu in enumerate(GPUtil.getGPUs()):
+                status[index] = {'utilization': gpu.load * 100, 'memory_used': gpu.memoryUsed * 1024 * 1024}
+        elif self.backend == 'sysfs':
+            for index, device in enumerate(self.devices):
+                busy = self._read_sysfs(device['busy_path'])
+                used = self._read_sysfs(device['vram_used_path'])
+                status[index] = {
+                    'utilization': float(busy) if busy and busy.isdigit() else None,
+                    'memory_used': int(used) if used and used.isdigit() else None,
+                }
+
+        with self.lock:
+            self.status = status
+        return status
+
+    def _run(self):
+
+        while not self.stop_event.is_set():
+            try:
+                self.refresh()
+                self.error = None
+            except Exception as e:
+                self.error = str(e)
+            self.stop_event.wait(self.refresh_interval)
+
+    def start(self):
+
+        # backend tanpa data dinamis tidak perlu thread
+        if self.backend in ('gputil', 'sysfs'):
+            self.thread = threading.Thread(target=self._run, name='GpuInfoProvider', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(self.refresh_interval + 1)
+
+    def describe(self):
+
+        if not self.devices:
+            return "GPU: Informasi tidak tersedia"
+
+        with self.lock:
+            status = self.status.get(0, {})
+        device = self.devices[0]
+        text = f"GPU: {device['name']}"
+        if status.get('utilization') is not None:
+            text += f", Utilization: {status['utilization']:.2f}%"
+        if device.get('memory_total'):
+            text += f", Memory: {get_size(device['memory_total'])}"
+        return text
+
+_gpu_provider = None
+
+def get_gpu_info():
+
+    # provider dibuat sekali, pemanggilan berikutnya hanya membaca cache
+    global _gpu_provider
+    try:
+        if _gpu_provider is None:
+            _gpu_provider = GpuInfoProvider().start()
+        return _gpu_provider.describe()
     except Exception as e:
         return f"Error mendapatkan info GPU: {e}"
 
-def monitor_system():
-    print("=" * 50)
-    print("🖥️  SISTEM MONITORING".center(50))
-    print("=" * 50)
+class RingBuffer:
+    def __init__(self, capacity):
+
+        # array('d') berukuran tetap, memori konstan berapapun lamanya monitor berjalan
+        self.capacity = capacity
+        self.values = array('d', bytes(8 * capacity))
+        self.timestamps = array('d', bytes(8 * capacity))
+        self.index = 0
+        self.count = 0
+
+    def append(self, value, timestamp):
+
+        self.values[self.index] = value
+        self.timestamps[self.index] = timestamp
+        self.index = (self.index + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def latest(self):
+
+        if not self.count:
+            return None
+        return self.values[(self.index - 1) % self.capacity]
+
+    def _ordered(self, buffer):
+
+        # urutan kronologis: bagian setelah index dulu, lalu bagian awal
+        if self.count < self.capacity:
+            return buffer[:self.count]
+        return buffer[self.index:] + buffer[:self.index]
+
+    def window(self, seconds=None, now=None):
+
+        values = self._ordered(self.values)
+        if seconds is None:
+            return values
+        timestamps = self._ordered(self.timestamps)
+        cutoff = (now if now is not None else time.time()) - seconds
+        start = bisect.bisect_left(timestamps, cutoff)
+        return values[start:]
+
+    def stats(self, seconds=None, now=None):
+
+        values = self.window(seconds, now)
+        if not values:
+            return None
+
+        if np is not None:
+            data = np.frombuffer(values, dtype=np.float64)
+            return {
+                'min': float(data.min()),
+                'max': float(data.max()),
+                'avg': float(data.mean()),
+                'p95': float(np.percentile(data, 95)),
+                'count': len(data),
+            }
+
+        ordered = sorted(values)
+        position = (len(ordered) - 1) * 0.95
+        lower = int(position)
+        upper = min(lower + 1, len(ordered) - 1)
+        p95 = ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+        return {
+            'min': ordered[0],
+            'max': ordered[-1],
+            'avg': sum(ordered) / len(ordered),
+            'p95': p95,
+            'count': len(ordered),
+        }
+
+class MetricStore:
+    def __init__(self, capacity=720):
+
+        self.capacity = capacity
+        self.series = {}
+        self.host = {}
+        self.lock = threading.Lock()
+
+    def append(self, name, value, timestamp):
+
+        with self.lock:
+            buffer = self.series.get(name)
+            if buffer is None:
+                buffer = self.series[name] = RingBuffer(self.capacity)
+            buffer.append(value, timestamp)
+
+    def record_sample(self, sample):
+
+        timestamp = sample['timestamp']
+        memory = sample['memory']
+        disk = sample['disk']
+        net_io = sample['net_io']
+
+        metrics = {
+            'cpu.total': sample['cpu_total'],
+            'memory.total': memory.total,
+            'memory.available': memory.available,
+            'memory.used': memory.used,
+            'memory.percent': memory.percent,
+            'disk.total': disk.total,
+            'disk.used': disk.used,
+            'disk.free': disk.free,
+            'disk.percent': disk.percent,
+            # laju dari delta counter, bukan total kumulatif
+            'net.rx_rate': sample['net_rx_rate'],
+            'net.tx_rate': sample['net_tx_rate'],
+            'net.bytes_recv': net_io.bytes_recv,
+            'net.bytes_sent': net_io.bytes_sent,
+            'sample.latency': sample['latency'],
+        }
+        for index, percentage in enumerate(sample['cpu_per_core']):
+            metrics[f'cpu.core.{index}'] = percentage
+
+        for name, value in metrics.items():
+            self.append(name, value, timestamp)
+
+    def latest(self, name, default=None):
+
+        with self.lock:
+            buffer = self.series.get(name)
+            value = buffer.latest() if buffer is not None else None
+        return default if value is None else value
+
+    def stats(self, name, seconds=None):
+
+        with self.lock:
+            buffer = self.series.get(name)
+            return buffer.stats(seconds) if buffer is not None else None
+
+    def core_count(self):
+
+        with self.lock:
+            return sum(1 for name in self.series if name.startswith('cpu.core.'))
+
+    def names(self):
+
+        with self.lock:
+            return list(self.series)
+
+ProcCpuTimes = namedtuple(
+    'ProcCpuTimes',
+    ['user', 'nice', 'system', 'idle', 'iowait', 'irq', 'softirq', 'steal', 'guest', 'guest_nice']
+)
+ProcMemory = namedtuple('ProcMemory', ['total', 'available', 'percent', 'used', 'free'])
+ProcNetIO = namedtuple('ProcNetIO', ['bytes_sent', 'bytes_recv', 'packets_sent', 'packets_recv'])
+ProcDiskUsage = namedtuple('ProcDiskUsage', ['total', 'used', 'free', 'percent'])
+
+class LinuxProcCollector:
+    # antarmuka sama dengan fungsi psutil yang dipakai SystemSampler
+    def __init__(self, proc_root='/proc'):
+
+        self.proc_root = proc_root
+        self.stat = ProcFile(os.path.join(proc_root, 'stat'))
+        self.meminfo = ProcFile(os.path.join(proc_root, 'meminfo'))
+        self.net_dev = ProcFile(os.path.join(proc_root, 'net', 'dev'))
+
+    def cpu_times(self, percpu=False):
+
+        # baris "cpu" = total, "cpuN" = per core; nilai dalam clock tick
+        total = None
+        cores = []
+        for line in self.stat.read().tobytes().split(b'\n'):
+            if not line.startswith(b'cpu'):
+                if cores:
+                    break
+                continue
+            fields = line.split()
+            values = [int(value) for value in fields[1:11]]
+            values += [0] * (10 - len(values))
+            if fields[0] == b'cpu':
+                total = ProcCpuTimes(*values)
+            else:
+                cores.append(ProcCpuTimes(*values))
+        return cores if percpu else total
+
+    def cpu_count(self):
+
+        return len(self.cpu_times(percpu=True))
+
+    def virtual_memory(self):
+
+        values = {}
+        for line in self.meminfo.read().tobytes().split(b'\n'):
+            name, _, rest = line.partition(b':')
+            if name in (b'MemTotal', b'MemFree', b'MemAvailable', b'Cached', b'SReclaimable'):
+                values[name] = int(rest.split()[0]) * 1024
+
+        total = values.get(b'MemTotal', 0)
+        free = values.get(b'MemFree', 0)
+        cached = values.get(b'Cached', 0) + values.get(b'SReclaimable', 0)
+        available = values.get(b'MemAvailable', free + cached)
+        used = max(0, total - available)
+        percent = round((total - available) / total * 100, 1) if total else 0.0
+        return ProcMemory(total, available, percent, used, free)
+
+    def net_io_counters(self):
+
+        bytes_recv = packets_recv = bytes_sent = packets_sent = 0
+        # dua baris pertama adalah header
+        for line in self.net_dev.read().tobytes().split(b'\n')[2:]:
+            _, _, data = line.partition(b':')
+            fields = data.split()
+            if len(fields) < 16:
+                continue
+            bytes_recv += int(fields[0])
+            packets_recv += int(fields[1])
+            bytes_sent += int(fields[8])
+            packets_sent += int(fields[9])
+        return ProcNetIO(bytes_sent, bytes_recv, packets_sent, packets_recv)
+
+    def disk_usage(self, path):
+
+        st = os.statvfs(path)
+        total = st.f_blocks * st.f_frsize
+        free = st.f_bavail * st.f_frsize
+        used = (st.f_blocks - st.f_bfree) * st.f_frsize
+        percent = round(used / (used + free) * 100, 1) if used + free else 0.0
+        return ProcDiskUsage(total, used, free, percent)
+
+    def close(self):
+
+        for proc_file in (self.stat, self.meminfo, self.net_dev):
+            proc_file.close()
+
+class SystemSampler:
+    def __init__(self, disk_path='/', backend=None):
+
+        self.disk_path = disk_path
+        # backend: modul psutil atau LinuxProcCollector (antarmuka sama)
+        self.backend = backend or psutil
+
+        # info host statis, dibaca sekali saja
+        uname = platform.uname()
+        self.host = {
+            'system': uname.system,
+            'release': uname.release,
+            'node': uname.node,
+            'version': uname.version,
+            'cpu_count': self.backend.cpu_count(),
+        }
+        try:
+            self.host['local_ip'] = socket.gethostbyname(socket.gethostname())
+        except Exception as ip_err:
+            self.host['local_ip'] = None
+            self.host['local_ip_error'] = str(ip_err)
+
+        # titik awal delta CPU dan jaringan
+        self.prev_cpu = [self._cpu_busy(t) for t in self.backend.cpu_times(percpu=True)]
+        self.prev_net = self.backend.net_io_counters()
+        self.prev_time = time.monotonic()
+
+    @staticmethod
+    def _cpu_busy(times):
+
+        # guest sudah terhitung di user (Linux), jangan dihitung dua kali
+        total = sum(times) - getattr(times, 'guest', 0) - getattr(times, 'guest_nice', 0)
+        idle = times.idle + getattr(times, 'iowait', 0)
+        return total, total - idle
+
+    @staticmethod
+    def _cpu_percent(prev, current):
+
+        prev_total, prev_busy = prev
+        total, busy = current
+        delta = total - prev_total
+        if delta <= 0:
+            return 0.0
+        return round(min(100.0, max(0.0, (busy - prev_busy) / delta * 100)), 1)
+
+    def sample(self):
+
+        start = time.perf_counter()
+        now = time.monotonic()
+        elapsed = now - self.prev_time
+
+        # total dan per-core dari satu pembacaan cpu_times, tanpa interval blocking
+        cpu_busy = [self._cpu_busy(t) for t in self.backend.cpu_times(percpu=True)]
+        per_core = [self._cpu_percent(p, c) for p, c in zip(self.prev_cpu, cpu_busy)]
+        # total = jumlah delta semua core
+        cpu_total = self._cpu_percent(
+            (sum(p[0] for p in self.prev_cpu), sum(p[1] for p in self.prev_cpu)),
+            (sum(c[0] for c in cpu_busy), sum(c[1] for c in cpu_busy))
+        )
+
+        net_io = self.backend.net_io_counters()
+        rx_rate = (net_io.bytes_recv - self.prev_net.bytes_recv) / elapsed if elapsed > 0 else 0.0
+        tx_rate = (net_io.bytes_sent - self.prev_net.bytes_sent) / elapsed if elapsed > 0 else 0.0
+
+        sample = {
+            'timestamp': time.time(),
+            'cpu_total': cpu_total,
+            'cpu_per_core': per_core,
+            'memory': self.backend.virtual_memory(),
+            'disk': self.backend.disk_usage(self.disk_path),
+            'net_io': net_io,
+            'net_rx_rate': max(0.0, rx_rate),
+            'net_tx_rate': max(0.0, tx_rate),
+        }
+
+        self.prev_cpu = cpu_busy
+        self.prev_net = net_io
+        self.prev_time = now
+
+        sample['latency'] = time.perf_counter() - start
+        return sample
+
+class FixedRateScheduler:
+    def __init__(self, period):
+
+        self.period = period
+        self.next_tick = time.monotonic() + period
+        self.skipped = 0
+
+    def wait(self):
+
+        # tidur sampai jadwal berikutnya, bukan "period" setelah kerja selesai,
+        # jadi waktu sampling tidak menggeser jadwal
+        now = time.monotonic()
+        delay = self.next_tick - now
+        if delay < 0:
+            # terlambat: lewati tick yang sudah terlewat, jangan menumpuk
+            missed = int(-delay // self.period) + 1
+            self.skipped += missed
+            self.next_tick += missed * self.period
+            delay = self.next_tick - now
+        time.sleep(delay)
+        self.next_tick += self.period
+
+class TerminalRenderer:
+    HEAT_CHARS = ' ▁▂▃▄▅▆▇█'
+
+    def __init__(self, stream=None, compact_cores=32, grid_width=32, ansi=None):
+
+        self.stream = stream or sys.stdout
+        self.compact_cores = compact_cores
+        self.grid_width = grid_width
+        # tanpa terminal (output di-pipe) tetap cetak frame penuh
+        self.ansi = ansi if ansi is not None else self.stream.isatty()
+        self.previous = []
+        self.frame_times = RingBuffer(256)
+        self.frames = 0
+        self.bytes_written = 0
+
+    def _heat(self, percentage):
+
+        index = int(round(percentage / 100 * (len(self.HEAT_CHARS) - 1)))
+        return self.HEAT_CHARS[min(max(index, 0), len(self.HEAT_CHARS) - 1)]
+
+    def core_lines(self, percentages):
+
+        if len(percentages) <= self.compact_cores:
+            return [f"   Core {i+1}: {percentage}%" for i, percentage in enumerate(percentages)]
+
+        # banyak core: satu karakter heat-bar per core
+        lines = []
+        for start in range(0, len(percentages), self.grid_width):
+            chunk = percentages[start:start + self.grid_width]
+            bar = ''.join(self._heat(percentage) for percentage in chunk)
+            lines.append(f"   {start + 1:>4}-{start + len(chunk):<4} |{bar}|")
+        return lines
+
+    def render(self, lines):
+
+        start = time.perf_counter()
+
+        if not self.ansi:
+            output = '\n'.join(lines) + '\n'
+        else:
+            parts = []
+            if not self.previous:
+                # frame pertama: bersihkan layar dan sembunyikan kursor
+                parts.append('\x1b[?25l\x1b[2J')
+            for row, line in enumerate(lines):
+                # hanya baris yang berubah yang ditulis ulang
+                if row >= len(self.previous) or self.previous[row] != line:
+                    parts.append(f'\x1b[{row + 1};1H{line}\x1b[K')
+            for row in range(len(lines), len(self.previous)):
+                parts.append(f'\x1b[{row + 1};1H\x1b[K')
+            parts.append(f'\x1b[{len(lines) + 1};1H')
+            output = ''.join(parts)
+
+        # satu write per frame
+        self.stream.write(output)
+        self.stream.flush()
+        self.previous = lines
+
+        self.frames += 1
+        self.bytes_written += len(output)
+        self.frame_times.append(time.perf_counter() - start, time.time())
+        return output
+
+    def close(self):
+
+        if self.ansi and self.previous:
+            self.stream.write('\x1b[?25h')
+            self.stream.flush()
+
+def build_frame(store, renderer, gpu_text, timestamp):
+
+    host = store.host
+    lines = [
+        "=" * 50,
+        "🖥️  SISTEM MONITORING".center(50),
+        "=" * 50,
+    ]
+
+    # info sistem utama
+    lines += [
+        "",
+        "📊 OVERVIEW SISTEM:",
+        f"🖥️  Sistem: {host['system']} {host['release']}",
+        f"🖲️  Hostname: {host['node']}",
+        f"🔧  Versi: {host['version']}",
+    ]
+
+    # CPU
+    cpu_stats = store.stats('cpu.total', 60)
+    lines += [
+        "",
+        "💻 PENGGUNAAN CPU:",
+        f"🔥 Total Penggunaan: {store.latest('cpu.total')}% "
+        f"(1 menit: rata-rata {cpu_stats['avg']:.1f}%, p95 {cpu_stats['p95']:.1f}%)",
+        "🌡️ Penggunaan per Core:",
+    ]
+    lines += renderer.core_lines([store.latest(f'cpu.core.{i}') for i in range(store.core_count())])
+
+    # memory (RAM)
+    lines += [
+        "",
+        "🧠 PENGGUNAAN MEMORY:",
+        f"💾 Total: {get_size(store.latest('memory.total'))}",
+        f"🔋 Tersedia: {get_size(store.latest('memory.available'))}",
+        f"🔥 Digunakan: {get_size(store.latest('memory.used'))} ({store.latest('memory.percent')}%)",
+    ]
+
+    # disk
+    lines += [
+        "",
+        "💽 PENGGUNAAN DISK:",
+        f"💾 Total: {get_size(store.latest('disk.total'))}",
+        f"🔥 Terpakai: {get_size(store.latest('disk.used'))} ({store.latest('disk.percent')}%)",
+        f"🆓 Tersedia: {get_size(store.latest('disk.free'))}",
+    ]
+
+    # jaringan
+    tx_stats = store.stats('net.tx_rate', 60)
+    rx_stats = store.stats('net.rx_rate', 60)
+    lines += [
+        "",
+        "🌐 STATISTIK JARINGAN:",
+        f"📤 Data Terkirim: {get_size(store.latest('net.bytes_sent'))} "
+        f"({get_size(store.latest('net.tx_rate'))}/s, puncak 1 menit {get_size(tx_stats['max'])}/s)",
+        f"📥 Data Diterima: {get_size(store.latest('net.bytes_recv'))} "
+        f"({get_size(store.latest('net.rx_rate'))}/s, puncak 1 menit {get_size(rx_stats['max'])}/s)",
+    ]
+
+    # IP
+    lines.append("")
+    if host['local_ip']:
+        lines.append(f"🌍 IP Lokal: {host['local_ip']}")
+    else:
+        lines.append(f"❌ Gagal mendapatkan IP: {host['local_ip_error']}")
+
+    lines += ["", f"🎮 {gpu_text}"]
+
+    # waktu
+    lines += [
+        "",
+        f"🕒 Waktu Pemantauan: {datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d %H:%M:%S')}",
+        f"⏱️  Latensi Sampling: {store.latest('sample.latency') * 1000:.1f} ms",
+        "",
+        "=" * 50,
+        "Tekan Ctrl+C untuk keluar".center(50),
+        "=" * 50,
+    ]
+    return lines
+
+def monitor_system(interval=5, backend=None):
+
+    sampler = SystemSampler(backend=backend)
+    scheduler = FixedRateScheduler(interval)
+    store = MetricStore()
+    store.host = sampler.host
+    renderer = TerminalRenderer()
 
     while True:
         try:
-            # info sistem utama
-            print("\n📊 OVERVIEW SISTEM:")
-            uname = platform.uname()
-            print(f"🖥️  Sistem: {uname.system} {uname.release}")
-            print(f"🖲️  Hostname: {uname.node}")
-            print(f"🔧  Versi: {uname.version}")
-            
-            # CPU
-            print("\n💻 PENGGUNAAN CPU:")
-            print(f"🔥 Total Penggunaan: {psutil.cpu_percent()}%")
-            print("🌡️ Penggunaan per Core:")
-            for i, percentage in enumerate(psutil.cpu_percent(percpu=True, interval=1)):
-                print(f"   Core {i+1}: {percentage}%")
-            
-            # memory (RAM)
-            memory = psutil.virtual_memory()
-            print("\n🧠 PENGGUNAAN MEMORY:")
-            print(f"💾 Total: {get_size(memory.total)}")
-            print(f"🔋 Tersedia: {get_size(memory.available)}")
-            print(f"🔥 Digunakan: {get_size(memory.used)} ({memory.percent}%)")
-            
-            # disk
-            disk = psutil.disk_usage('/')
-            print("\n💽 PENGGUNAAN DISK:")
-            print(f"💾 Total: {get_size(disk.total)}")
-            print(f"🔥 Terpakai: {get_size(disk.used)} ({disk.percent}%)")
-            print(f"🆓 Tersedia: {get_size(disk.free)}")
-            
-            # jaringan
-            net_io = psutil.net_io_counters()
-            print("\n🌐 STATISTIK JARINGAN:")
-            print(f"📤 Data Terkirim: {get_size(net_io.bytes_sent)}")
-            print(f"📥 Data Diterima: {get_size(net_io.bytes_recv)}")
-            
-            # IP
-            try:
-                local_ip = socket.gethostbyname(socket.gethostname())
-                print(f"\n🌍 IP Lokal: {local_ip}")
-            except Exception as ip_err:
-                print(f"\n❌ Gagal mendapatkan IP: {ip_err}")
-            
-          
-            print(f"\n🎮 {get_gpu_info()}")
-            
-            # waktu
-            print(f"\n🕒 Waktu Pemantauan: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-            
-            print("\n" + "=" * 50)
-            print("Tekan Ctrl+C untuk keluar".center(50))
-            print("=" * 50)
-            
-            time.sleep(5)  # jeda 5 detik
+            sample = sampler.sample()
+            store.record_sample(sample)
+            renderer.render(build_frame(store, renderer, get_gpu_info(), sample['timestamp']))
+
+            scheduler.wait()  # jeda sesuai jadwal tetap
             
         except KeyboardInterrupt:
+            renderer.close()
             print("\n✋ Pemantauan dihentikan oleh pengguna.")
             break
         except Exception as e:
             print(f"❌ Terjadi kesalahan: {e}")
-            time.sleep(5)
+            scheduler.wait()
+
+def benchmark_renderer(frames=200, cores=128):
+
+    # mode headless: render ke buffer memori dengan data sintetis
+    store = MetricStore()
+    store.host = {'system': 'Linux', 'release': 'bench', 'node': 'bench', 'version': '-', 'local_ip': '127.0.0.1'}
+    renderer = TerminalRenderer(stream=io.StringIO(), ansi=True)
+
+    for frame in range(frames):
+        now = time.time()
+        values = {
+            'cpu.total': (frame * 7) % 100,
+            'memory.total': 64 * 1024 ** 3, 'memory.available': 32 * 1024 ** 3,
+            'memory.used': 32 * 1024 ** 3, 'memory.percent': 50.0,
+            'disk.total': 1024 ** 4, 'disk.used': 512 * 1024 ** 3, 'disk.free': 512 * 1024 ** 3,
+            'disk.percent': 50.0,
+            'net.rx_rate': frame * 1000.0, 'net.tx_rate': frame * 500.0,
+            'net.bytes_recv': frame * 10 ** 6, 'net.bytes_sent': frame * 10 ** 5,
+            'sample.latency': 0.001,
+        }
+        for core in range(cores):
+            values[f'cpu.core.{core}'] = float((core * 13 + frame * 3) % 100)
+        for name, value in values.items():
+            store.append(name, value, now)
+        renderer.render(build_frame(store, renderer, 'GPU: bench', now))
+
+    stats = renderer.frame_times.stats()
+    print(f"📈 {frames} frame, {cores} core | rata-rata {stats['avg'] * 1000:.3f} ms | "
+          f"p95 {stats['p95'] * 1000:.3f} ms | {renderer.bytes_written / frames:.0f} byte/frame")
+    return stats
+
+def benchmark_backends(iterations=2000):
+
+    # bandingkan biaya satu sample: psutil vs pembacaan /proc langsung
+    backends = [('psutil', psutil)]
+    if platform.system() == 'Linux':
+        backends.append(('/proc langsung', LinuxProcCollector()))
+
+    results = {}
+    for label, backend in backends:
+        sampler = SystemSampler(backend=backend)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            sampler.sample()
+        elapsed = time.perf_counter() - start
+        results[label] = elapsed / iterations
+        print(f"📈 {label:<15} | {elapsed / iterations * 1e6:8.1f} µs/sample")
+
+    return results
 
-def main():
+def main(backend=None):
     try:
-        monitor_system()
+        monitor_system(backend=backend)
     except Exception as e:
         print(f"Kesalahan utama: {e}")
 
 if __name__ == "__main__":
-    main()
+    if '--headless-bench' in sys.argv:
+        benchmark_renderer()
+    elif '--bench-backend' in sys.argv:
+        benchmark_backends()
+    elif '--proc-backend' in sys.argv:
+        main(LinuxProcCollector())
+    else:
+        main()
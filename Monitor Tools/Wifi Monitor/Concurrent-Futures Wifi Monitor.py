@@ -1,18 +1,21 @@
-import os
 import platform
-import subprocess
-import socket
 import threading
 import time
 import logging
-import concurrent.futures
-from typing import Dict, List, Optional
+
+from icmp_sweep import IcmpSweeper, iter_targets
+from network_state import get_network_state
+from dns_resolver import ReverseResolver
+from device_inventory import DeviceInventory
 
 class RexzeaWifiMonitoring:
-    def __init__(self, log_file='wifi_monitoring.log'):
+    def __init__(self, log_file='wifi_monitoring.log', inventory_db='wifi_inventory.db'):
 
         self.os_type = platform.system()
         self.logger = self._setup_logger(log_file)
+        self.resolver = ReverseResolver()
+        self.inventory_db = inventory_db
+        self.inventory = None
 
     def _setup_logger(self, log_file):
         logging.basicConfig(
@@ -24,94 +27,56 @@ class RexzeaWifiMonitoring:
 
     def identify_network(self):
         try:
-            gateways = self._get_network_gateways()
+            # satu snapshot dari memori, dibaca ulang hanya saat route/alamat berubah
+            state = get_network_state()
             return {
-                'gateway': gateways[0] if gateways else 'Tidak Terdeteksi',
-                'local_ip': self._get_local_ip(),
-                'network_prefix': self._get_network_prefix()
+                'gateway': state.gateway or 'Tidak Terdeteksi',
+                'local_ip': state.local_ip,
+                'network_prefix': str(state.network) if state.network else 'Tidak Terdeteksi',
+                'interface': state.interface
             }
         except Exception as e:
             self.logger.error(f"Kesalahan identifikasi jaringan: {e}")
             return None
 
     def _get_local_ip(self):
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            return local_ip
-        except Exception:
-            return '127.0.0.1'
+        return get_network_state().local_ip
+
+    def _get_networks(self):
+        # prefix asli dari interface (bisa /16, /22, plus jaringan IPv6)
+        state = get_network_state()
+        return state.interface, state.networks
 
     def _get_network_prefix(self):
-        local_ip = self._get_local_ip()
-        return '.'.join(local_ip.split('.')[:3])
+        network = get_network_state().network
+        return str(network) if network else None
 
     def _get_network_gateways(self):
-        try:
-            if self.os_type == 'Windows':
-                result = subprocess.run(['ipconfig'], capture_output=True, text=True)
-                gateways = []
-                for line in result.stdout.split('\n'):
-                    if 'Default Gateway' in line:
-                        gateway = line.split(':')[1].strip()
-                        if gateway != '0.0.0.0' and gateway:
-                            gateways.append(gateway)
-                return gateways
-            elif self.os_type in ['Linux', 'Darwin']:
-                result = subprocess.run(['ip', 'route'], capture_output=True, text=True)
-                gateways = []
-                for line in result.stdout.split('\n'):
-                    if 'default via' in line:
-                        gateway = line.split('via')[1].split()[0]
-                        gateways.append(gateway)
-                return gateways
-        except Exception as e:
-            self.logger.error(f"Kesalahan mendapatkan gateway: {e}")
-            return []
+        return list(get_network_state().gateways)
+
+    def iter_active_devices(self, timeout=1, max_threads=100, targets=None):
+        interface, networks = self._get_networks()
+        if targets is None:
+            if not networks:
+                self.logger.warning("Tidak ada jaringan yang bisa di-scan")
+                return
+            targets = iter_targets(networks, interface)
+
+        # satu socket ICMP untuk semua host, target dialirkan bertahap dari generator
+        sweeper = IcmpSweeper(timeout=timeout, fallback_workers=max_threads)
+        responders = (
+            {'ip': ip, 'hostname': ip, 'status': 'Active', 'rtt_ms': round(rtt * 1000, 2)}
+            for ip, rtt in sweeper.iter_sweep(targets)
+        )
 
-    def scan_network_fast(self, timeout=1, max_threads=100):
-        network_prefix = self._get_network_prefix()
-        active_devices = []
-
-        def ping_ip(ip):
-            try:
-                result = subprocess.run(
-                    ['ping', '-c', '1', '-W', str(timeout), ip], 
-                    capture_output=True, 
-                    text=True,
-                    timeout=timeout
-                )
-                
-                if result.returncode == 0:
-                    try:
-                        hostname = socket.gethostbyaddr(ip)[0]
-                    except:
-                        hostname = ip
-                    
-                    return {
-                        'ip': ip,
-                        'hostname': hostname,
-                        'status': 'Active'
-                    }
-            except subprocess.TimeoutExpired:
-                pass
-            except Exception:
-                pass
-            return None
+        # reverse DNS jadi tahap terpisah (async + cache), device di-yield begitu namanya datang
+        yield from self.resolver.enrich(responders)
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_threads) as executor:
-            ips_to_scan = [f"{network_prefix}.{i}" for i in range(1, 255)]
-            
-            futures = [executor.submit(ping_ip, ip) for ip in ips_to_scan]
-            
-            for future in concurrent.futures.as_completed(futures):
-                result = future.result()
-                if result:
-                    active_devices.append(result)
+        self.logger.info(f"Sweep ICMP ({sweeper.mode}): {sweeper.received} balasan dari {sweeper.sent} paket")
+        self.logger.info(f"Reverse DNS: {self.resolver.get_stats()}")
 
-        return active_devices
+    def scan_network_fast(self, timeout=1, max_threads=100):
+        return list(self.iter_active_devices(timeout, max_threads))
 
     def get_network_info(self):
         network = self.identify_network()
@@ -123,23 +88,61 @@ class RexzeaWifiMonitoring:
             'device_count': len(devices)
         }
 
-    def continuous_monitoring(self, interval=300):
+    def _on_device_event(self, event, device):
+
+        label = 'bergabung' if event == 'join' else 'keluar'
+        print(f"{'🟢' if event == 'join' else '🔴'} Perangkat {label}: {device['ip']} ({device['hostname'] or device['mac'] or '-'})")
+        self.logger.info(f"Perangkat {label}: {device}")
+
+    def open_inventory(self, interval=60, cold_interval=900):
+
+        # host yang dikenal diprobe tiap interval, alamat kosong dicicil selama cold_interval
+        self.inventory = DeviceInventory(
+            self.inventory_db,
+            live_interval=interval,
+            cold_interval=cold_interval,
+            on_event=self._on_device_event
+        )
+        return self.inventory
+
+    def monitor_cycle(self, verbose=True):
+
+        # satu siklus monitoring, dipakai loop sendiri maupun daemon
+        start = time.perf_counter()
+        interface, networks = self._get_networks()
+        if networks:
+            targets = self.inventory.plan(iter_targets(networks, interface))
+            self.inventory.record(self.iter_active_devices(targets=targets), networks=networks)
+        else:
+            # offline: jangan catat sebagai miss, nanti semua perangkat dianggap keluar
+            self.logger.warning("Tidak ada jaringan yang bisa di-scan, siklus dilewati")
+        devices = self.inventory.active_devices()
+        scan_seconds = time.perf_counter() - start
+
+        if verbose:
+            print("\n--- Monitoring Jaringan ---")
+            print(f"Jaringan: {self.identify_network()}")
+            print(f"Perangkat Aktif: {len(devices)}")
+            print("Daftar Perangkat:")
+            for device in devices:
+                print(f"  - IP: {device['ip']}, Hostname: {device['hostname'] or device['ip']}")
+
+        self.logger.info(f"Monitoring Jaringan: {len(devices)} perangkat aktif, inventaris {self.inventory.get_stats()}")
+        return {
+            'device_count': len(devices),
+            'scan_seconds': scan_seconds,
+            'inventory': self.inventory.get_stats()
+        }
+
+    def continuous_monitoring(self, interval=60, cold_interval=900):
+        self.open_inventory(interval, cold_interval)
+
         def monitor_task():
             while True:
                 try:
-                    network_info = self.get_network_info()
-                    
-                    print("\n--- Monitoring Jaringan ---")
-                    print(f"Jaringan: {network_info['network']}")
-                    print(f"Perangkat Aktif: {network_info['device_count']}")
-                    print("Daftar Perangkat:")
-                    for device in network_info['active_devices']:
-                        print(f"  - IP: {device['ip']}, Hostname: {device['hostname']}")
-                    
-                    self.logger.info(f"Monitoring Jaringan: {network_info}")
-                    
+                    self.monitor_cycle()
                     time.sleep(interval)
-                
+
                 except Exception as e:
                     self.logger.error(f"Kesalahan monitoring: {e}")
                     break
@@ -148,16 +151,26 @@ class RexzeaWifiMonitoring:
         monitoring_thread.daemon = True
         monitoring_thread.start()
 
+    def close(self):
+
+        if self.inventory is not None:
+            self.inventory.close()
+        self.resolver.close()
+
 def main():
     wifi_monitor = RexzeaWifiMonitoring()
     
-    wifi_monitor.continuous_monitoring(interval=300)  
-    
     try:
+        # probe host yang dikenal tiap menit, alamat kosong disapu bertahap tiap 15 menit
+        wifi_monitor.continuous_monitoring(interval=60, cold_interval=900)
+
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("Monitoring dihentikan.")
+    finally:
+        # flush inventaris dan hentikan resolver walau keluar karena error
+        wifi_monitor.close()
 
 if __name__ == "__main__":
     main()
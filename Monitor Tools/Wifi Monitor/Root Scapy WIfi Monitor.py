@@ -1,19 +1,43 @@
-import os
+import sys
 import platform
 import subprocess
-import psutil
-import socket
-import requests
 import threading
 import time
 import logging
-import uuid
 from typing import Dict, List, Optional
 
+from icmp_sweep import IcmpSweeper, iter_targets
+from network_state import get_network_state
+from neighbour_cache import NeighbourCache
+from dns_resolver import ReverseResolver
+from device_inventory import DeviceInventory
+from arp_sweep import ArpSweeper
+from wifi_link import WifiLinkSampler, find_wireless_interface
+from throughput import ActiveThroughputTest, PassiveThroughputMonitor, ThroughputServer
+
 class WiFiMonitor:
-    def __init__(self, log_file='wifi_monitoring.log'):
+    def __init__(self, log_file='wifi_monitoring.log', inventory_db='wifi_inventory.db',
+                 discovery='auto', pcap_path=None, speed_endpoint=None, speed_test_interval=1800,
+                 speed_interface=None):
         self.os_type = platform.system()
         self.current_network = None
+        # jaringan yang disapu terakhir, None di mode replay (alamat capture bukan jaringan live)
+        self.networks = None
+        self.neighbours = NeighbourCache()
+        self.resolver = ReverseResolver()
+        self.inventory_db = inventory_db
+        self.inventory = None
+        # discovery: 'auto' (ARP kalau root + scapy), 'arp', atau 'icmp'
+        self.discovery = discovery
+        self.pcap_path = pcap_path
+        # endpoint tes kecepatan (host, port) yang menjalankan ThroughputServer
+        self.speed_endpoint = speed_endpoint
+        self.speed_test_interval = speed_test_interval
+        self.speed_interface = speed_interface
+        self.speed_result = None
+        self.speed_thread = None
+        self.passive = None
+        self.link_sampler = None
         
         logging.basicConfig(
             filename=log_file, 
@@ -37,15 +61,17 @@ class WiFiMonitor:
                         }
             
             elif self.os_type == 'Linux':
-                result = subprocess.run(['iwconfig'], 
-                                        capture_output=True, 
-                                        text=True)
-                for line in result.stdout.split('\n'):
-                    if 'ESSID' in line:
-                        ssid = line.split('ESSID:')[1].strip('"')
+                # SSID dari cache iw di sampler (hanya di-refresh saat link berubah), tanpa iwconfig
+                sampler = self._get_link_sampler()
+                if sampler is not None:
+                    link = sampler.latest()
+                    if link.get('ssid'):
                         return {
-                            'ssid': ssid,
-                            'platform': 'Linux'
+                            'ssid': link['ssid'],
+                            'platform': 'Linux',
+                            'interface': link['interface'],
+                            'bssid': link.get('bssid'),
+                            'bitrate_mbps': link.get('rx_bitrate_mbps')
                         }
             
             elif self.os_type == 'Darwin':  # MacOS
@@ -65,70 +91,133 @@ class WiFiMonitor:
         
         return None
 
-    def get_local_devices(self) -> List[Dict[str, str]]:
+    def _icmp_responders(self, targets):
+
+        # ping semua alamat sekaligus lewat satu socket ICMP, tidak satu per satu lagi
+        sweeper = IcmpSweeper(timeout=1)
+        # MAC dari tabel tetangga, dibaca sekali per sweep untuk semua platform
+        for test_ip, _ in sweeper.iter_sweep(targets):
+            yield {'ip': test_ip, 'hostname': 'Unknown', 'mac': self.neighbours.lookup(test_ip)}
+        self.logger.info(f"Sweep ICMP ({sweeper.mode}): {sweeper.received} balasan dari {sweeper.sent} paket")
+
+    def _arp_responders(self, arp, targets):
+
+        # satu burst ARP untuk semua alamat IPv4, MAC langsung dari balasan
+        macs, leftovers = arp.sweep(targets)
+        self.logger.info(f"Sweep ARP ({'replay' if self.pcap_path else 'live'}): {arp.received} balasan dari {arp.sent} request")
+        for test_ip, mac in macs.items():
+            yield {'ip': test_ip, 'hostname': 'Unknown', 'mac': mac}
+
+        # target IPv6 (multicast/tetangga) tidak bisa di-ARP, tetap lewat ICMP
+        if leftovers:
+            yield from self._icmp_responders(leftovers)
+
+    def get_local_devices(self, plan=None) -> Optional[List[Dict[str, str]]]:
         try:
-            hostname = socket.gethostname()
-            local_ip = socket.gethostbyname(hostname)
-            
-            ip_prefix = '.'.join(local_ip.split('.')[:3])
-            
-            devices = []
-            
-            for i in range(1, 255):
-                test_ip = f"{ip_prefix}.{i}"
-                try:
-                    result = subprocess.run(['ping', '-c', '1', '-W', '1', test_ip], 
-                                            capture_output=True, 
-                                            text=True)
-                    
-                    if result.returncode == 0:
-                        try:
-                            hostname = socket.gethostbyaddr(test_ip)[0]
-                        except:
-                            hostname = 'Unknown'
-                        
-                        if self.os_type == 'Windows':
-                            try:
-                                arp_result = subprocess.run(['arp', '-a', test_ip], 
-                                                            capture_output=True, 
-                                                            text=True)
-                                mac = [line.split()[1] for line in arp_result.stdout.split('\n') if test_ip in line][0]
-                            except:
-                                mac = ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff) for elements in range(0,2*6,2)][::-1])
-                        else:
-                            mac = 'Unknown'
-                        
-                        devices.append({
-                            'ip': test_ip,
-                            'hostname': hostname,
-                            'mac': mac
-                        })
-                except Exception as e:
-                    pass
-            
-            return devices
-        
+            # jaringan asli dari interface (tidak selalu /24), diambil dari cache state jaringan
+            state = get_network_state()
+            interface, networks = state.interface, state.networks
+            arp = ArpSweeper(interface=interface, pcap_path=self.pcap_path)
+            self.networks = None if self.pcap_path else networks
+            if self.pcap_path:
+                # mode replay: target = frame ARP yang terjadwal di capture, bukan jaringan live
+                targets = arp.replay_targets()
+            elif not networks:
+                # None = sweep tidak dijalankan, beda dengan "tidak ada perangkat"
+                self.logger.warning("Tidak ada jaringan yang bisa di-scan")
+                return None
+            else:
+                targets = iter_targets(networks, interface)
+            if plan is not None:
+                targets = plan(targets)
+
+            # mode L2 (scapy) butuh root atau file pcap, selain itu pakai ICMP
+            if self.pcap_path or (self.discovery != 'icmp' and arp.available()):
+                responders = self._arp_responders(arp, targets)
+            else:
+                responders = self._icmp_responders(targets)
+
+            # reverse DNS lewat resolver async dengan cache, tidak memblok sweep
+            return list(self.resolver.enrich(responders, default='Unknown'))
+
         except Exception as e:
+            # sweep gagal bukan berarti semua perangkat offline, jangan dicatat ke inventaris
             self.logger.error(f"Kesalahan mendapatkan perangkat: {e}")
-            return []
+            return None
+
+    def _run_speed_test(self):
 
-    def get_network_speed(self) -> Dict[str, float]:
         try:
-            speed_test = requests.get('https://api.ipify.org/speed', timeout=10)
-            
-            download_speed = 1 / speed_test.elapsed.total_seconds() * 8
-            
-            return {
-                'download_speed': round(download_speed, 2),
-                'upload_speed': round(download_speed / 2, 2)
-            }
+            host, port = self.speed_endpoint
+            result = ActiveThroughputTest(host, port).run()
+            self.logger.info(f"Tes kecepatan aktif: {result}")
+            self.speed_result = result
         except Exception as e:
             self.logger.error(f"Kesalahan tes kecepatan: {e}")
-            return {'download_speed': 0, 'upload_speed': 0}
+        finally:
+            self.speed_thread = None
+
+    def _busiest_interface(self, rates):
+
+        candidates = {name: rate for name, rate in rates.items() if name != 'lo'}
+        if not candidates:
+            return None
+        return max(candidates, key=lambda name: candidates[name]['rx_mbps'] + candidates[name]['tx_mbps'])
+
+    def get_network_speed(self) -> Dict[str, float]:
+        # trafik live dari selisih counter interface (pasif, tanpa trafik tambahan)
+        if self.passive is None:
+            self.passive = PassiveThroughputMonitor().start()
+        rates = self.passive.rates()
+        interface = self.speed_interface or self._busiest_interface(rates)
+        live = rates.get(interface, {})
+
+        # tes aktif (stream TCP paralel) hanya kalau endpoint diset, jalan di thread sendiri
+        result = self.speed_result or {}
+        stale = time.time() - result.get('measured_at', 0) > self.speed_test_interval
+        if self.speed_endpoint and stale and self.speed_thread is None:
+            self.speed_thread = threading.Thread(target=self._run_speed_test, daemon=True)
+            self.speed_thread.start()
+
+        return {
+            'interface': interface,
+            'rx_mbps': live.get('rx_mbps', 0),
+            'tx_mbps': live.get('tx_mbps', 0),
+            'download_speed': result.get('download_mbps'),
+            'upload_speed': result.get('upload_mbps'),
+            'rtt_ms': result.get('rtt_ms'),
+            'jitter_ms': result.get('jitter_ms')
+        }
+
+    def _get_link_sampler(self):
+
+        # sampler /proc/net/wireless + sysfs, jalan di background sampai 10 Hz
+        if self.link_sampler is None and self.os_type == 'Linux':
+            try:
+                if find_wireless_interface() is not None:
+                    self.link_sampler = WifiLinkSampler(rate_hz=10).start()
+            except OSError as e:
+                self.logger.error(f"Sampler Wi-Fi tidak tersedia: {e}")
+        return self.link_sampler
+
+    def get_link_quality(self) -> Dict[str, object]:
+
+        sampler = self._get_link_sampler()
+        if sampler is None:
+            return {}
+        link = sampler.latest()
+        link['signal_avg_1m'] = (sampler.stats('signal_dbm', 60) or {}).get('avg')
+        link['quality_avg_1m'] = (sampler.stats('quality', 60) or {}).get('avg')
+        return link
 
     def get_signal_strength(self) -> Optional[int]:
         try:
-            if self.os_type == 'Windows':
+            if self.os_type == 'Linux':
+                link = self.get_link_quality()
+                if link.get('quality') is not None:
+                    return int(link['quality'])
+
+            elif self.os_type == 'Windows':
                 result = subprocess.run(['netsh', 'wlan', 'show', 'interfaces'], 
                                         capture_output=True, 
                                         text=True)
@@ -141,30 +230,74 @@ class WiFiMonitor:
         
         return None
 
-    def continuous_monitoring(self, interval=300):
+    def _on_device_event(self, event, device):
+
+        label = 'bergabung' if event == 'join' else 'keluar'
+        print(f"{'🟢' if event == 'join' else '🔴'} Perangkat {label}: {device['ip']} ({device['hostname'] or device['mac'] or '-'})")
+        self.logger.info(f"Perangkat {label}: {device}")
+
+    def open_inventory(self, interval=60, cold_interval=900):
+
+        # inventaris: host dikenal diprobe tiap interval, alamat kosong dicicil tiap cold_interval
+        self.inventory = DeviceInventory(
+            self.inventory_db,
+            live_interval=interval,
+            cold_interval=cold_interval,
+            on_event=self._on_device_event
+        )
+        return self.inventory
+
+    def monitor_cycle(self, verbose=True):
+
+        start = time.perf_counter()
+        network_info = self.identify_current_network()
+        found = self.get_local_devices(plan=self.inventory.plan)
+        if found is not None:
+            self.inventory.record(found, networks=self.networks)
+        devices = self.inventory.active_devices()
+        scan_seconds = time.perf_counter() - start
+        speed_info = self.get_network_speed()
+        signal_strength = self.get_signal_strength()
+        link = self.get_link_quality()
+
+        self.logger.info(f"Jaringan: {network_info}")
+        self.logger.info(f"Perangkat Terhubung: {len(devices)}")
+        self.logger.info(f"Kecepatan: {speed_info}")
+        self.logger.info(f"Kekuatan Sinyal: {signal_strength}%")
+
+        if verbose:
+            print("\n--- Monitoring Jaringan ---")
+            print(f"Jaringan: {network_info}")
+            print(f"Perangkat Terhubung: {len(devices)}")
+            print(f"Trafik {speed_info['interface']}: ⬇ {speed_info['rx_mbps']} Mbps ⬆ {speed_info['tx_mbps']} Mbps")
+            if speed_info['download_speed'] is not None:
+                print(f"Kecepatan Download: {speed_info['download_speed']} Mbps")
+                print(f"Kecepatan Upload: {speed_info['upload_speed']} Mbps")
+                print(f"RTT: {speed_info['rtt_ms']} ms (jitter {speed_info['jitter_ms']} ms)")
+            print(f"Kekuatan Sinyal: {signal_strength}%")
+            if link.get('signal_dbm') is not None:
+                print(f"Sinyal: {link['signal_dbm']} dBm (rata-rata 1 menit {link['signal_avg_1m']} dBm), "
+                      f"Noise: {link.get('noise_dbm') or '-'} dBm, Bitrate: {link.get('rx_bitrate_mbps') or '-'} Mbps")
+            print("Daftar Perangkat:")
+            for device in devices:
+                print(f"  - IP: {device['ip']}, Hostname: {device['hostname'] or 'Unknown'}, MAC: {device['mac'] or 'Unresolved'}")
+
+        return {
+            'device_count': len(devices),
+            'scan_seconds': scan_seconds,
+            'inventory': self.inventory.get_stats(),
+            'speed': speed_info,
+            'signal_strength': signal_strength,
+            'link': link
+        }
+
+    def continuous_monitoring(self, interval=60, cold_interval=900):
+        self.open_inventory(interval, cold_interval)
+
         def monitor_task():
             while True:
                 try:
-                    network_info = self.identify_current_network()
-                    devices = self.get_local_devices()
-                    speed_info = self.get_network_speed()
-                    signal_strength = self.get_signal_strength()
-
-                    self.logger.info(f"Jaringan: {network_info}")
-                    self.logger.info(f"Perangkat Terhubung: {len(devices)}")
-                    self.logger.info(f"Kecepatan: {speed_info}")
-                    self.logger.info(f"Kekuatan Sinyal: {signal_strength}%")
-
-                    print("\n--- Monitoring Jaringan ---")
-                    print(f"Jaringan: {network_info}")
-                    print(f"Perangkat Terhubung: {len(devices)}")
-                    print(f"Kecepatan Download: {speed_info['download_speed']} Mbps")
-                    print(f"Kecepatan Upload: {speed_info['upload_speed']} Mbps")
-                    print(f"Kekuatan Sinyal: {signal_strength}%")
-                    print("Daftar Perangkat:")
-                    for device in devices:
-                        print(f"  - IP: {device['ip']}, Hostname: {device['hostname']}, MAC: {device['mac']}")
-
+                    self.monitor_cycle()
                     time.sleep(interval)
                 
                 except Exception as e:
@@ -175,18 +308,83 @@ class WiFiMonitor:
         monitoring_thread.daemon = True
         monitoring_thread.start()
 
+    def close(self):
+
+        # hentikan sampler background dan tutup inventaris
+        if self.link_sampler is not None:
+            self.link_sampler.stop()
+        if self.passive is not None:
+            self.passive.stop()
+        if self.inventory is not None:
+            self.inventory.close()
+        self.resolver.close()
+
 def main():
     wifi_monitor = WiFiMonitor()
     
-    wifi_monitor.continuous_monitoring(interval=300)  
-
     try:
+        wifi_monitor.continuous_monitoring(interval=60, cold_interval=900)
+
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("Monitoring dihentikan.")
+    finally:
+        # flush inventaris dan hentikan sampler/resolver walau keluar karena error
+        wifi_monitor.close()
+
+def replay_arp(pcap_path):
+
+    # discovery offline dari file pcap, untuk testing tanpa jaringan
+    wifi_monitor = WiFiMonitor(discovery='arp', pcap_path=pcap_path)
+    try:
+        devices = wifi_monitor.get_local_devices()
+    finally:
+        wifi_monitor.close()
+    if devices is None:
+        print(f"❌ Replay ARP dari {pcap_path} gagal, cek wifi_monitoring.log")
+        return
+    print(f"📼 Replay ARP dari {pcap_path}: {len(devices)} perangkat")
+    for device in devices:
+        print(f"  - IP: {device['ip']}, Hostname: {device['hostname']}, MAC: {device['mac']}")
+
+def run_speed_test(endpoint=None):
+
+    # tanpa endpoint: jalankan server pengganti lokal supaya tes bisa dicoba offline
+    server = None
+    if endpoint is None:
+        server = ThroughputServer().start()
+        host, port = server.address
+    else:
+        host, _, port = endpoint.rpartition(':')
+        port = int(port)
+    try:
+        result = ActiveThroughputTest(host, port).run()
+    finally:
+        if server is not None:
+            server.stop()
+    print(f"🚀 Tes kecepatan ke {host}:{port}")
+    print(f"   Download : {result['download_mbps']} Mbps ({result['streams']} stream)")
+    print(f"   Upload   : {result['upload_mbps']} Mbps")
+    print(f"   RTT      : {result['rtt_ms']} ms (jitter {result['jitter_ms']} ms)")
+    if result['errors']:
+        print(f"   ⚠️ Stream gagal: {', '.join(result['errors'])}")
 
 if __name__ == "__main__":
-    main()
+    if '--arp-replay' in sys.argv:
+        replay_arp(sys.argv[sys.argv.index('--arp-replay') + 1])
+    elif '--speed-test' in sys.argv:
+        index = sys.argv.index('--speed-test')
+        run_speed_test(sys.argv[index + 1] if len(sys.argv) > index + 1 else None)
+    elif '--speed-server' in sys.argv:
+        server = ThroughputServer('0.0.0.0', int(sys.argv[sys.argv.index('--speed-server') + 1])).start()
+        print(f"📡 Server tes kecepatan di {server.address[0]}:{server.address[1]}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            server.stop()
+    else:
+        main()
 
 # Proses Kompleks dan lama serta beresiko mengalami Frezee
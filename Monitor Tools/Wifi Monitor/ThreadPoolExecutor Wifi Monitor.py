@@ -1,22 +1,28 @@
-import os
+import sys
 import platform
 import subprocess
-import socket
-import uuid
-import concurrent.futures
-import ipaddress
 import threading
 import time
 import logging
-import requests
-from typing import Dict, List, Optional
+
+from icmp_sweep import IcmpSweeper, iter_targets
+from network_state import get_network_state
+from neighbour_cache import NeighbourCache, UNRESOLVED
+from dns_resolver import ReverseResolver
+from device_inventory import DeviceInventory
 
 class WiFiMonitor:
-    def __init__(self, log_file='wifi_monitoring.log'):
+    def __init__(self, log_file='wifi_monitoring.log', inventory_db='wifi_inventory.db'):
 
         self.os_type = platform.system()
         self.logger = self._setup_logging(log_file)
         self.local_ip = self._get_local_ip()
+        self.interface = None
+        self.networks = []
+        self.neighbours = NeighbourCache()
+        self.resolver = ReverseResolver()
+        self.inventory_db = inventory_db
+        self.inventory = None
         self.subnet = self._get_subnet()
 
     def _setup_logging(self, log_file):
@@ -30,107 +36,53 @@ class WiFiMonitor:
 
     def _get_local_ip(self):
 
-        try:
-            # buat soket sementara untuk mencari IP
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect(("8.8.8.8", 80))
-            local_ip = s.getsockname()[0]
-            s.close()
-            return local_ip
-        except Exception as e:
-            self.logger.error(f"Gagal mendapatkan IP lokal: {e}")
-            return '127.0.0.1'
+        # dari service state jaringan (cache), tanpa soket ke 8.8.8.8
+        return get_network_state().local_ip
 
     def _get_subnet(self):
 
         try:
-            # buat objek IP dengan subnet /24
-            network = ipaddress.IPv4Network(f"{self.local_ip}/24", strict=False)
-            return network
+            # ambil prefix asli dari interface, bukan /24 tetap
+            state = get_network_state()
+            self.local_ip = state.local_ip
+            self.interface, self.networks = state.interface, state.networks
+            return state.network
         except Exception as e:
             self.logger.error(f"Gagal mendapatkan subnet: {e}")
             return None
 
-    def fast_network_scan(self, timeout=1, max_threads=100):
+    def iter_network_scan(self, timeout=1, max_threads=100, targets=None):
 
-        if not self.subnet:
-            return []
-
-        devices = []
-        
-        # melakukan ping pada satu IP
-        def ping_ip(ip):
-            try:
-                # pakai ping dengan timeout singkat
-                result = subprocess.run(
-                    ['ping', '-c', '1', '-W', str(timeout), str(ip)],
-                    capture_output=True,
-                    text=True,
-                    timeout=timeout
-                )
-                
-                if result.returncode == 0:
-                    try:
-                        # ccoba dapatkan hostname
-                        hostname = socket.gethostbyaddr(str(ip))[0]
-                    except:
-                        hostname = 'Unknown'
-                    
-                    # mencari MAC address
-                    mac = self._get_mac_address(str(ip))
-                    
-                    return {
-                        'ip': str(ip),
-                        'hostname': hostname,
-                        'mac': mac
-                    }
-            except subprocess.TimeoutExpired:
-                pass
-            except Exception as e:
-                self.logger.error(f"Kesalahan ping {ip}: {e}")
-            
-            return None
+        # murah: hanya baca ulang kalau route/alamat berubah sejak sweep terakhir
+        self.subnet = self._get_subnet()
+        if not self.networks:
+            return
+
+        # sweep ICMP dalam satu socket, target dialirkan dari generator (aman untuk /16)
+        sweeper = IcmpSweeper(timeout=timeout, fallback_workers=max_threads)
+        if targets is None:
+            targets = iter_targets(self.networks, self.interface)
+
+        # MAC dari cache tabel tetangga sudah murah, tidak perlu thread pool lagi
+        responders = (
+            {'ip': ip, 'hostname': 'Unknown', 'mac': self._get_mac_address(ip), 'rtt_ms': round(rtt * 1000, 2)}
+            for ip, rtt in sweeper.iter_sweep(targets)
+        )
 
-        # pakai ThreadPoolExecutor buat mengconcurrent scanning
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_threads) as executor:
-            # Buat daftar IP untuk di-ping
-            ip_list = [str(ip) for ip in self.subnet.hosts()]
-            
-            # jalankan ping secara concurrent
-            future_to_ip = {executor.submit(ping_ip, ip): ip for ip in ip_list}
-            
-            for future in concurrent.futures.as_completed(future_to_ip):
-                result = future.result()
-                if result:
-                    devices.append(result)
-        
-        return devices
+        # hostname diisi resolver async (dengan cache) begitu jawaban DNS datang
+        yield from self.resolver.enrich(responders, default='Unknown')
+
+        self.logger.info(f"Sweep ICMP ({sweeper.mode}): {sweeper.received} balasan dari {sweeper.sent} paket")
+        self.logger.info(f"Reverse DNS: {self.resolver.get_stats()}")
+
+    def fast_network_scan(self, timeout=1, max_threads=100):
+
+        return list(self.iter_network_scan(timeout, max_threads))
 
     def _get_mac_address(self, ip):
 
-        try:
-            if self.os_type == 'Windows':
-                #pakai perintah arp untuk Windows
-                arp_result = subprocess.run(['arp', '-a', ip], 
-                                            capture_output=True, 
-                                            text=True)
-                mac_lines = [line for line in arp_result.stdout.split('\n') if ip in line]
-                if mac_lines:
-                    return mac_lines[0].split()[1]
-            elif self.os_type == 'Linux':
-                # kalau Linux, memeakai cara yang beda (lupa)
-                arp_result = subprocess.run(['ip', 'neigh', 'show'], 
-                                            capture_output=True, 
-                                            text=True)
-                mac_lines = [line for line in arp_result.stdout.split('\n') if ip in line]
-                if mac_lines:
-                    return mac_lines[0].split()[4]
-        except Exception as e:
-            self.logger.error(f"Gagal mendapatkan MAC address: {e}")
-        
-       
-        return ':'.join(['{:02x}'.format((uuid.getnode() >> elements) & 0xff) 
-                         for elements in range(0,2*6,2)][::-1])
+        # MAC dari cache tabel tetangga (satu kali baca per sweep), bukan subprocess per host
+        return self.neighbours.lookup(ip)
 
     def get_network_info(self):
 
@@ -147,28 +99,65 @@ class WiFiMonitor:
             self.logger.error(f"Kesalahan mendapatkan info jaringan: {e}")
             return {}
 
-    def continuous_monitoring(self, interval=300):
+    def _on_device_event(self, event, device):
+
+        label = 'bergabung' if event == 'join' else 'keluar'
+        print(f"{'🟢' if event == 'join' else '🔴'} Perangkat {label}: {device['ip']} ({device['hostname'] or device['mac'] or '-'})")
+        self.logger.info(f"Perangkat {label}: {device}")
+
+    def open_inventory(self, interval=60, cold_interval=900):
+
+        # inventaris menentukan alamat mana yang perlu diprobe di tiap siklus
+        self.inventory = DeviceInventory(
+            self.inventory_db,
+            live_interval=interval,
+            cold_interval=cold_interval,
+            on_event=self._on_device_event
+        )
+        return self.inventory
+
+    def monitor_cycle(self, verbose=True):
+
+        # hanya host yang jatuh tempo yang di-scan
+        start = time.perf_counter()
+        self.subnet = self._get_subnet()
+        if self.networks:
+            targets = self.inventory.plan(iter_targets(self.networks, self.interface))
+            self.inventory.record(self.iter_network_scan(targets=targets), networks=self.networks)
+        else:
+            # offline: jangan catat sebagai miss, nanti semua perangkat dianggap keluar
+            self.logger.warning("Tidak ada jaringan yang bisa di-scan, siklus dilewati")
+        devices = self.inventory.active_devices()
+        scan_seconds = time.perf_counter() - start
+
+        # mencetak informasi
+        if verbose:
+            print("\n--- Monitoring Jaringan ---")
+            print(f"IP Lokal: {self.local_ip}")
+            print(f"Subnet: {self.subnet or 'Unknown'}")
+            print("Perangkat Terdeteksi:")
+            for device in devices:
+                print(f"  - IP: {device['ip']}, "
+                      f"Hostname: {device['hostname'] or 'Unknown'}, "
+                      f"MAC: {device['mac'] or 'Unresolved'}")
+
+        # log informasi
+        self.logger.info(f"Pemindaian Jaringan: {len(devices)} perangkat terdeteksi, inventaris {self.inventory.get_stats()}")
+        return {
+            'device_count': len(devices),
+            'scan_seconds': scan_seconds,
+            'inventory': self.inventory.get_stats()
+        }
+
+    def continuous_monitoring(self, interval=60, cold_interval=900):
+
+        self.open_inventory(interval, cold_interval)
 
-        
         def monitor_task():
             while True:
                 try:
-                    # mencari informasi jaringan
-                    network_info = self.get_network_info()
-                    
-                    # mencetak informasi
-                    print("\n--- Monitoring Jaringan ---")
-                    print(f"IP Lokal: {network_info.get('local_ip', 'Unknown')}")
-                    print(f"Subnet: {network_info.get('subnet', 'Unknown')}")
-                    print("Perangkat Terdeteksi:")
-                    for device in network_info.get('devices', []):
-                        print(f"  - IP: {device['ip']}, "
-                              f"Hostname: {device['hostname']}, "
-                              f"MAC: {device['mac']}")
-                    
-                    # log informasi
-                    self.logger.info(f"Pemindaian Jaringan: {len(network_info.get('devices', []))} perangkat terdeteksi")
-                    
+                    self.monitor_cycle()
+
                     # tunggu interval
                     time.sleep(interval)
                 
@@ -181,27 +170,85 @@ class WiFiMonitor:
         monitoring_thread.daemon = True
         monitoring_thread.start()
 
+    def close(self):
+
+        if self.inventory is not None:
+            self.inventory.close()
+        self.resolver.close()
+
+def per_host_mac_lookup(ip, os_type):
+
+    # cara lama: satu subprocess per host, dipakai hanya untuk benchmark
+    try:
+        if os_type == 'Windows':
+            result = subprocess.run(['arp', '-a', ip], capture_output=True, text=True)
+            mac_lines = [line for line in result.stdout.split('\n') if ip in line]
+            if mac_lines:
+                return mac_lines[0].split()[1]
+        else:
+            result = subprocess.run(['ip', 'neigh', 'show'], capture_output=True, text=True)
+            mac_lines = [line for line in result.stdout.split('\n') if line.startswith(ip + ' ')]
+            if mac_lines and 'lladdr' in mac_lines[0]:
+                return mac_lines[0].split()[4]
+    except Exception:
+        pass
+    return None
+
+def benchmark_mac_lookup(hosts=200, rounds=3):
+
+    # bandingkan resolusi MAC per host vs satu kali baca tabel tetangga
+    os_type = platform.system()
+    cache = NeighbourCache()
+    cache.refresh()
+    known = list(cache.entries)
+    targets = (known + [f"10.255.{i // 256}.{i % 256}" for i in range(hosts)])[:hosts]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        per_host = {ip: per_host_mac_lookup(ip, os_type) for ip in targets}
+    per_host_ms = (time.perf_counter() - start) / rounds * 1000
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        # tiap sweep mulai dengan cache kedaluwarsa, jadi tabel dibaca ulang sekali
+        cache.loaded_at = 0.0
+        bulk = {ip: cache.lookup(ip) for ip in targets}
+    bulk_ms = (time.perf_counter() - start) / rounds * 1000
+
+    resolved_per_host = sum(1 for mac in per_host.values() if mac)
+    resolved_bulk = sum(1 for mac in bulk.values() if mac != UNRESOLVED)
+    print(f"📊 Benchmark MAC lookup ({len(targets)} host, {len(known)} entri tabel tetangga)")
+    print(f"   Per host : {per_host_ms:.1f} ms/sweep, {resolved_per_host} terdeteksi")
+    print(f"   Bulk     : {bulk_ms:.2f} ms/sweep, {resolved_bulk} terdeteksi, stats {cache.get_stats()}")
+    print(f"   Speedup  : {per_host_ms / max(bulk_ms, 1e-6):.0f}x")
+
 def main():
     # nisialisasi monitor jaringan
     wifi_monitor = WiFiMonitor()
     
-    # lakukan scan pas awal
-    initial_scan = wifi_monitor.get_network_info()
-    print("Perangkat Terdeteksi Saat Ini:")
-    for device in initial_scan.get('devices', []):
-        print(f"  - {device}")
-    
-    # mullai monitoring berkelanjutan
-    wifi_monitor.continuous_monitoring(interval=300)  # Setiap 5 menit
-
-    # mempertahankan program berjalan
     try:
+        # lakukan scan pas awal
+        initial_scan = wifi_monitor.get_network_info()
+        print("Perangkat Terdeteksi Saat Ini:")
+        for device in initial_scan.get('devices', []):
+            print(f"  - {device}")
+
+        # mullai monitoring berkelanjutan
+        wifi_monitor.continuous_monitoring(interval=60, cold_interval=900)  # host dikenal tiap menit, alamat kosong tiap 15 menit
+
+        # mempertahankan program berjalan
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         print("Monitoring dihentikan.")
+    finally:
+        # flush inventaris dan hentikan resolver walau keluar karena error
+        wifi_monitor.close()
 
 if __name__ == "__main__":
-    main()
+    if '--bench-neigh' in sys.argv:
+        benchmark_mac_lookup()
+    else:
+        main()
 
 # Proses Kompleks dan lama serta beresiko mengalami Frezee
@@ -0,0 +1,124 @@
+import os
+import time
+import threading
+import ipaddress
+
+try:
+    from scapy.all import ARP, Ether, AsyncSniffer, rdpcap, sendp, wrpcap
+except ImportError:
+    ARP = None
+
+BROADCAST_MAC = 'ff:ff:ff:ff:ff:ff'
+# ARP op 2 = "is-at" (balasan)
+ARP_REPLY = 2
+
+def is_root():
+
+    return hasattr(os, 'geteuid') and os.geteuid() == 0
+
+class ArpSweeper:
+    def __init__(self, interface=None, timeout=1.0, pcap_path=None, record_path=None):
+
+        self.interface = interface
+        # satu jendela sniff untuk semua balasan
+        self.timeout = timeout
+        # mode offline: balasan dibaca dari file pcap, tidak ada paket yang dikirim
+        self.pcap_path = pcap_path
+        # simpan paket yang tertangkap supaya bisa di-replay untuk testing
+        self.record_path = record_path
+
+        self.sent = 0
+        self.received = 0
+        self.packets = None
+
+    def available(self):
+
+        if ARP is None:
+            return False
+        return bool(self.pcap_path) or is_root()
+
+    def _build_requests(self, targets, wanted, skipped):
+
+        # generator paket: hanya IPv4 yang bisa di-ARP, sisanya dikembalikan ke caller
+        for target in targets:
+            ip = target.split('%')[0]
+            if ipaddress.ip_address(ip).version != 4:
+                skipped.append(target)
+                continue
+            wanted.add(ip)
+            self.sent += 1
+            yield Ether(dst=BROADCAST_MAC) / ARP(pdst=ip)
+
+    def _replay_packets(self):
+
+        # file pcap dibaca sekali per sweeper, dipakai untuk target dan balasan
+        if ARP is None:
+            raise RuntimeError("Replay ARP butuh scapy")
+        if self.packets is None:
+            self.packets = rdpcap(self.pcap_path)
+        return self.packets
+
+    def replay_targets(self):
+
+        # jadwal sweep di capture: alamat yang di-request (atau membalas), urut seperti di file
+        targets = {}
+        for packet in self._replay_packets():
+            if ARP not in packet:
+                continue
+            arp = packet[ARP]
+            targets[arp.pdst if arp.op != ARP_REPLY else arp.psrc] = None
+        return list(targets)
+
+    def _collect(self, packets, wanted):
+
+        found = {}
+        for packet in packets:
+            if ARP not in packet or packet[ARP].op != ARP_REPLY:
+                continue
+            ip = packet[ARP].psrc
+            if wanted is not None and ip not in wanted:
+                continue
+            if ip not in found:
+                self.received += 1
+                found[ip] = packet[ARP].hwsrc.lower()
+        return found
+
+    def sweep(self, targets=None):
+
+        # return ({ip: mac}, target non-IPv4 yang harus disapu cara lain)
+        skipped = []
+        if self.pcap_path:
+            wanted = None
+            if targets is not None:
+                # target tetap dikonsumsi (mis. plan inventaris), hanya balasan yang dijadwalkan yang dihitung
+                wanted = set()
+                for target in targets:
+                    ip = target.split('%')[0]
+                    if ':' in ip:
+                        skipped.append(target)
+                    else:
+                        wanted.add(ip)
+                        self.sent += 1
+            return self._collect(self._replay_packets(), wanted), skipped
+
+        wanted = set()
+        ready = threading.Event()
+        sniffer = AsyncSniffer(
+            iface=self.interface,
+            lfilter=lambda packet: ARP in packet and packet[ARP].op == ARP_REPLY,
+            started_callback=ready.set,
+            store=True
+        )
+        sniffer.start()
+        ready.wait(2)
+        try:
+            # satu burst request untuk seluruh subnet, tanpa jeda antar paket
+            sendp(self._build_requests(targets or [], wanted, skipped), iface=self.interface, verbose=False)
+            time.sleep(self.timeout)
+        finally:
+            sniffer.stop()
+
+        packets = sniffer.results or []
+        if self.record_path:
+            wrpcap(self.record_path, packets)
+        return self._collect(packets, wanted), skipped
@@ -0,0 +1,293 @@
+import sqlite3
+import ipaddress
+import threading
+import time
+
+SCHEMA_MIGRATIONS = [
+    # v1: inventaris perangkat, riwayat liveness, event join/leave
+    (1, [
+        '''
+        CREATE TABLE IF NOT EXISTS devices (
+            ip TEXT PRIMARY KEY,
+            mac TEXT,
+            hostname TEXT,
+            first_seen INTEGER,
+            last_seen INTEGER,
+            last_probe INTEGER,
+            next_probe INTEGER,
+            state TEXT,
+            misses INTEGER DEFAULT 0,
+            rtt_ms REAL
+        )
+        ''',
+        '''
+        CREATE TABLE IF NOT EXISTS liveness (
+            id INTEGER PRIMARY KEY,
+            ip TEXT,
+            ts INTEGER,
+            alive INTEGER,
+            rtt_ms REAL
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_liveness_ip_ts ON liveness(ip, ts)',
+        '''
+        CREATE TABLE IF NOT EXISTS device_events (
+            id INTEGER PRIMARY KEY,
+            ts INTEGER,
+            ip TEXT,
+            event TEXT,
+            mac TEXT,
+            hostname TEXT
+        )
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_device_events_ts ON device_events(ts)',
+        '''
+        CREATE TABLE IF NOT EXISTS scan_state (
+            key TEXT PRIMARY KEY,
+            value INTEGER
+        )
+        ''',
+    ]),
+    # v2: pembersihan riwayat tiap siklus pakai index ts, bukan scan seluruh tabel
+    (2, [
+        'CREATE INDEX IF NOT EXISTS idx_liveness_ts ON liveness(ts)',
+    ]),
+]
+
+UPSERT_DEVICE_SQL = '''
+    INSERT INTO devices (ip, mac, hostname, first_seen, last_seen, last_probe, next_probe, state, misses, rtt_ms)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(ip) DO UPDATE SET
+        mac = excluded.mac,
+        hostname = excluded.hostname,
+        last_seen = excluded.last_seen,
+        last_probe = excluded.last_probe,
+        next_probe = excluded.next_probe,
+        state = excluded.state,
+        misses = excluded.misses,
+        rtt_ms = excluded.rtt_ms
+'''
+
+# nilai MAC/hostname placeholder dari scanner, jangan timpa data yang sudah diketahui
+PLACEHOLDERS = {None, '', 'Unknown', 'Unresolved'}
+
+def open_database(db_path):
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=5000')
+    return conn
+
+def migrate_database(conn):
+
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    for target, statements in SCHEMA_MIGRATIONS:
+        if target <= version:
+            continue
+
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {target}')
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        version = target
+    return version
+
+class Device:
+    __slots__ = ('ip', 'mac', 'hostname', 'first_seen', 'last_seen', 'last_probe',
+                 'next_probe', 'state', 'misses', 'rtt_ms')
+
+    def __init__(self, ip, mac=None, hostname=None, first_seen=0, last_seen=0, last_probe=0,
+                 next_probe=0, state='up', misses=0, rtt_ms=None):
+
+        self.ip = ip
+        self.mac = mac
+        self.hostname = hostname
+        self.first_seen = first_seen
+        self.last_seen = last_seen
+        self.last_probe = last_probe
+        self.next_probe = next_probe
+        self.state = state
+        self.misses = misses
+        self.rtt_ms = rtt_ms
+
+    def as_row(self):
+
+        return (self.ip, self.mac, self.hostname, self.first_seen, self.last_seen, self.last_probe,
+                self.next_probe, self.state, self.misses, self.rtt_ms)
+
+    def as_dict(self):
+
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+class DeviceInventory:
+    def __init__(self, db_path='wifi_inventory.db', live_interval=60, cold_interval=900,
+                 leave_after=2, backoff_base=60, backoff_max=1800, history_days=7,
+                 on_event=None):
+
+        # host aktif diprobe tiap live_interval, alamat kosong cukup sekali per cold_interval
+        self.live_interval = live_interval
+        self.cold_interval = cold_interval
+        # host dianggap pergi setelah leave_after probe berturut-turut gagal
+        self.leave_after = leave_after
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.history_days = history_days
+        self.on_event = on_event
+
+        self.lock = threading.Lock()
+        self.conn = open_database(db_path)
+        migrate_database(self.conn)
+
+        self.devices = {}
+        for row in self.conn.execute('SELECT ip, mac, hostname, first_seen, last_seen, last_probe, '
+                                     'next_probe, state, misses, rtt_ms FROM devices'):
+            self.devices[row[0]] = Device(*row)
+
+        state = self.conn.execute("SELECT value FROM scan_state WHERE key = 'last_full_sweep'").fetchone()
+        self.last_full_sweep = state[0] if state else 0
+
+        self.probed_known = set()
+        self.stats = {'planned': 0, 'skipped': 0, 'joins': 0, 'leaves': 0}
+
+    @property
+    def cold_slices(self):
+
+        return max(1, int(self.cold_interval // self.live_interval))
+
+    def plan(self, targets, now=None):
+
+        # generator: hanya alamat yang jatuh tempo yang diteruskan ke sweeper
+        now = int(now if now is not None else time.time())
+        # sweep penuh hanya sekali di awal, setelah itu alamat dingin dicicil per slice
+        full_sweep = not self.last_full_sweep
+        cold_slice = (now // self.live_interval) % self.cold_slices
+        self.probed_known = set()
+
+        for target in targets:
+            ip = target.split('%')[0]
+            device = self.devices.get(ip)
+            if device is not None:
+                due = device.next_probe <= now
+                if due:
+                    self.probed_known.add(ip)
+            else:
+                address = ipaddress.ip_address(ip)
+                # alamat dingin disebar per slice supaya tiap siklus hanya sebagian kecil yang diprobe
+                due = full_sweep or address.is_multicast or int(address) % self.cold_slices == cold_slice
+
+            if due:
+                self.stats['planned'] += 1
+                yield target
+            else:
+                self.stats['skipped'] += 1
+
+        if full_sweep:
+            self.last_full_sweep = now
+            with self.lock, self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO scan_state (key, value) VALUES ('last_full_sweep', ?)", (now,))
+
+    def _backoff(self, device):
+
+        # host yang baru pergi dicek lagi dengan jeda yang makin panjang
+        exponent = max(0, device.misses - self.leave_after)
+        return min(self.backoff_base * (2 ** exponent), self.backoff_max)
+
+    def record(self, results, now=None, networks=None):
+
+        now = int(now if now is not None else time.time())
+        alive = {result['ip'].split('%')[0]: result for result in results}
+        events = []
+        history = []
+        retired = set()
+
+        if networks is not None:
+            # jaringan berganti: perangkat di luar semua jaringan yang disapu tidak akan diprobe lagi,
+            # statusnya jadi 'unknown' supaya tidak 'up' selamanya
+            for ip, device in self.devices.items():
+                if device.state == 'unknown' or ip in alive:
+                    continue
+                address = ipaddress.ip_address(ip)
+                if any(address in network for network in networks):
+                    continue
+                if device.state == 'up':
+                    events.append(('leave', device))
+                device.state = 'unknown'
+                retired.add(ip)
+
+        for ip, result in alive.items():
+            device = self.devices.get(ip)
+            if device is None:
+                device = self.devices[ip] = Device(ip, first_seen=now, state='new')
+            if device.state != 'up':
+                events.append(('join', device))
+            if result.get('mac') not in PLACEHOLDERS:
+                device.mac = result['mac']
+            if result.get('hostname') not in PLACEHOLDERS and result.get('hostname') != ip:
+                device.hostname = result['hostname']
+            device.rtt_ms = result.get('rtt_ms')
+            device.last_seen = device.last_probe = now
+            device.next_probe = now + self.live_interval
+            device.state = 'up'
+            device.misses = 0
+            history.append((ip, now, 1, device.rtt_ms))
+
+        for ip in self.probed_known - alive.keys() - retired:
+            device = self.devices[ip]
+            device.misses += 1
+            device.last_probe = now
+            if device.state == 'up' and device.misses >= self.leave_after:
+                device.state = 'down'
+                events.append(('leave', device))
+            if device.state == 'down':
+                device.next_probe = now + self._backoff(device)
+            else:
+                device.next_probe = now + self.live_interval
+            history.append((ip, now, 0, None))
+
+        changed = [self.devices[ip].as_row() for ip in alive.keys() | self.probed_known | retired]
+        self.probed_known = set()
+        with self.lock, self.conn:
+            self.conn.executemany(UPSERT_DEVICE_SQL, changed)
+            self.conn.executemany('INSERT INTO liveness (ip, ts, alive, rtt_ms) VALUES (?, ?, ?, ?)', history)
+            self.conn.executemany(
+                'INSERT INTO device_events (ts, ip, event, mac, hostname) VALUES (?, ?, ?, ?, ?)',
+                [(now, device.ip, event, device.mac, device.hostname) for event, device in events]
+            )
+            self.conn.execute('DELETE FROM liveness WHERE ts < ?', (now - self.history_days * 86400,))
+
+        emitted = []
+        for event, device in events:
+            self.stats['joins' if event == 'join' else 'leaves'] += 1
+            emitted.append((event, device.as_dict()))
+            if self.on_event is not None:
+                self.on_event(event, device.as_dict())
+        return emitted
+
+    def active_devices(self):
+
+        return [device.as_dict() for device in self.devices.values() if device.state == 'up']
+
+    def history(self, ip, limit=50):
+
+        with self.lock:
+            return self.conn.execute(
+                'SELECT ts, alive, rtt_ms FROM liveness WHERE ip = ? ORDER BY ts DESC LIMIT ?', (ip, limit)
+            ).fetchall()
+
+    def get_stats(self):
+
+        stats = dict(self.stats)
+        stats['known'] = len(self.devices)
+        stats['up'] = sum(1 for device in self.devices.values() if device.state == 'up')
+        return stats
+
+    def close(self):
+
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,346 @@
+import os
+import queue
+import random
+import socket
+import struct
+import asyncio
+import ipaddress
+import threading
+import time
+import concurrent.futures
+
+DNS_TYPE_PTR = 12
+DNS_CLASS_IN = 1
+DNS_RCODE_NXDOMAIN = 3
+
+def reverse_name(ip):
+
+    return ipaddress.ip_address(ip.split('%')[0]).reverse_pointer
+
+def build_ptr_query(query_id, name):
+
+    # header: id, flags (RD), 1 pertanyaan
+    header = struct.pack('!HHHHHH', query_id, 0x0100, 1, 0, 0, 0)
+    qname = b''.join(bytes([len(label)]) + label.encode('ascii') for label in name.split('.') if label) + b'\x00'
+    return header + qname + struct.pack('!HH', DNS_TYPE_PTR, DNS_CLASS_IN)
+
+def _read_name(message, offset):
+
+    # nama DNS dengan dukungan kompresi pointer, return (nama, offset setelah nama)
+    labels = []
+    end = None
+    jumps = 0
+    while True:
+        length = message[offset]
+        if length & 0xc0 == 0xc0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3f) << 8) | message[offset + 1]
+            jumps += 1
+            if jumps > 32:
+                raise ValueError('pointer DNS berputar')
+            continue
+        if length == 0:
+            offset += 1
+            break
+        labels.append(message[offset + 1:offset + 1 + length].decode('ascii', 'replace'))
+        offset += 1 + length
+    return '.'.join(labels), end if end is not None else offset
+
+def parse_ptr_response(message, query_id):
+
+    # return (hostname, ttl, rcode); hostname None kalau tidak ada record PTR
+    if len(message) < 12:
+        raise ValueError('respon DNS terlalu pendek')
+    response_id, flags, qdcount, ancount, _, _ = struct.unpack('!HHHHHH', message[:12])
+    if response_id != query_id or not flags & 0x8000:
+        raise ValueError('respon DNS tidak cocok')
+    rcode = flags & 0x000f
+
+    offset = 12
+    for _ in range(qdcount):
+        _, offset = _read_name(message, offset)
+        offset += 4
+
+    for _ in range(ancount):
+        _, offset = _read_name(message, offset)
+        rtype, _, ttl, rdlength = struct.unpack('!HHIH', message[offset:offset + 10])
+        offset += 10
+        if rtype == DNS_TYPE_PTR:
+            hostname, _ = _read_name(message, offset)
+            return hostname, ttl, rcode
+        offset += rdlength
+    return None, None, rcode
+
+def read_nameserver(path='/etc/resolv.conf'):
+
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == 'nameserver':
+                    return parts[1], 53
+    except OSError:
+        pass
+    return None
+
+def read_hosts_file(path=None):
+
+    # /etc/hosts tetap dihormati seperti gethostbyaddr (127.0.0.1 -> localhost)
+    if path is None:
+        path = r'C:\Windows\System32\drivers\etc\hosts' if os.name == 'nt' else '/etc/hosts'
+    names = {}
+    try:
+        with open(path) as f:
+            for line in f:
+                parts = line.split('#', 1)[0].split()
+                if len(parts) >= 2:
+                    names.setdefault(parts[0], parts[1])
+    except OSError:
+        pass
+    return names
+
+class _DnsProtocol(asyncio.DatagramProtocol):
+    def __init__(self, future):
+
+        self.future = future
+
+    def datagram_received(self, data, addr):
+
+        if not self.future.done():
+            self.future.set_result(data)
+
+    def error_received(self, exc):
+
+        if not self.future.done():
+            self.future.set_exception(exc)
+
+class ReverseResolver:
+    def __init__(self, nameserver=None, timeout=1.0, concurrency=32,
+                 positive_ttl=3600, negative_ttl=300, hosts_path=None, fallback_workers=4):
+
+        # nameserver (host, port); default dari resolv.conf, None -> getnameinfo sistem
+        self.nameserver = nameserver if nameserver is not None else read_nameserver()
+        self.timeout = timeout
+        self.concurrency = concurrency
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self.hosts = read_hosts_file(hosts_path)
+
+        # cache: ip -> (hostname atau None, waktu kedaluwarsa)
+        self.cache = {}
+        self.in_flight = {}
+        self.loop = None
+        self.thread = None
+        self.semaphore = None
+        self.start_lock = threading.Lock()
+
+        # getnameinfo sistem tidak bisa dibatalkan: thread sendiri yang jumlahnya terbatas,
+        # bukan default executor yang bisa menumpuk thread macet
+        self.fallback_workers = fallback_workers
+        self.fallback_busy = 0
+        self.executor = None
+
+        # stats diubah dari loop resolver dan thread pemanggil (cache hit di submit)
+        self.stats_lock = threading.Lock()
+        self.stats = {'queries': 0, 'hits': 0, 'negative_hits': 0, 'timeouts': 0, 'failures': 0}
+
+    def _count(self, name):
+
+        with self.stats_lock:
+            self.stats[name] += 1
+
+    def _cached(self, ip):
+
+        entry = self.cache.get(ip)
+        if entry is not None and entry[1] > time.monotonic():
+            self._count('hits' if entry[0] else 'negative_hits')
+            return True, entry[0]
+        return False, None
+
+    def _store(self, ip, hostname, ttl=None):
+
+        if hostname:
+            lifetime = min(ttl, self.positive_ttl) if ttl else self.positive_ttl
+        else:
+            lifetime = self.negative_ttl
+        self.cache[ip] = (hostname, time.monotonic() + lifetime)
+
+    async def _query(self, ip):
+
+        loop = asyncio.get_running_loop()
+        if self.nameserver is None:
+            # tanpa resolv.conf (mis. Windows): pakai resolver sistem di executor sendiri
+            if self.fallback_busy >= self.fallback_workers:
+                # semua thread masih menunggu lookup yang macet, jangan antrekan lagi
+                raise asyncio.TimeoutError
+            if self.executor is None:
+                self.executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.fallback_workers, thread_name_prefix='ReverseResolver')
+            self.fallback_busy += 1
+            future = loop.run_in_executor(
+                self.executor, socket.getnameinfo, (ip.split('%')[0], 0), socket.NI_NAMEREQD)
+
+            def release(_):
+                self.fallback_busy -= 1
+
+            future.add_done_callback(release)
+            try:
+                host, _ = await asyncio.wait_for(asyncio.shield(future), self.timeout)
+                return host, None
+            except asyncio.TimeoutError:
+                # TimeoutError turunan OSError, jangan sampai terhitung sebagai "tidak ada nama"
+                raise
+            except (socket.gaierror, OSError):
+                return None, None
+
+        query_id = random.getrandbits(16)
+        future = loop.create_future()
+        family = socket.AF_INET6 if ':' in self.nameserver[0] else socket.AF_INET
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _DnsProtocol(future), remote_addr=self.nameserver, family=family)
+        try:
+            transport.sendto(build_ptr_query(query_id, reverse_name(ip)))
+            deadline = loop.time() + self.timeout
+            while True:
+                data = await asyncio.wait_for(future, max(0.0, deadline - loop.time()))
+                try:
+                    hostname, ttl, _ = parse_ptr_response(data, query_id)
+                    return hostname, ttl
+                except ValueError:
+                    # paket nyasar / id beda, tunggu respon berikutnya
+                    future = loop.create_future()
+                    transport.get_protocol().future = future
+        finally:
+            transport.close()
+
+    async def resolve(self, ip):
+
+        found, hostname = self._cached(ip)
+        if found:
+            return hostname
+        if ip in self.hosts:
+            return self.hosts[ip]
+
+        # satu query untuk IP yang sama walaupun diminta berkali-kali
+        if ip in self.in_flight:
+            return await asyncio.shield(self.in_flight[ip])
+
+        task = asyncio.ensure_future(self._resolve_uncached(ip))
+        self.in_flight[ip] = task
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self.in_flight.pop(ip, None)
+
+    async def _resolve_uncached(self, ip):
+
+        if self.semaphore is None:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+        async with self.semaphore:
+            self._count('queries')
+            try:
+                hostname, ttl = await self._query(ip)
+            except asyncio.TimeoutError:
+                self._count('timeouts')
+                hostname, ttl = None, None
+            except (OSError, ValueError):
+                self._count('failures')
+                hostname, ttl = None, None
+        self._store(ip, hostname, ttl)
+        return hostname
+
+    def _ensure_loop(self):
+
+        # event loop resolver jalan di thread sendiri, dipakai bersama antar sweep
+        with self.start_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+                self.thread.start()
+
+    def submit(self, ip):
+
+        found, hostname = self._cached(ip)
+        if found or ip in self.hosts:
+            future = concurrent.futures.Future()
+            future.set_result(hostname if found else self.hosts[ip])
+            return future
+        self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.resolve(ip), self.loop)
+
+    def enrich(self, devices, field='hostname', default=None):
+
+        # yield tiap device begitu namanya datang (atau gagal), urutan sesuai jawaban DNS
+        ready = queue.Queue()
+        total = 0
+
+        def on_done(future, device):
+            try:
+                hostname = future.result()
+            except Exception:
+                hostname = None
+            device[field] = hostname or (device['ip'] if default is None else default)
+            ready.put(device)
+
+        for device in devices:
+            total += 1
+            self.submit(device['ip']).add_done_callback(lambda f, d=device: on_done(f, d))
+            while True:
+                try:
+                    item = ready.get_nowait()
+                except queue.Empty:
+                    break
+                total -= 1
+                yield item
+
+        while total:
+            total -= 1
+            yield ready.get()
+
+    def _snapshot(self):
+
+        with self.stats_lock:
+            stats = dict(self.stats)
+        stats['cached'] = len(self.cache)
+        stats['in_flight'] = len(self.in_flight)
+        return stats
+
+    def get_stats(self):
+
+        # cache dan in_flight milik loop resolver, snapshot diambil di thread loop
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            async def snapshot():
+                return self._snapshot()
+
+            try:
+                return asyncio.run_coroutine_threadsafe(snapshot(), loop).result(timeout=self.timeout)
+            except (concurrent.futures.TimeoutError, RuntimeError):
+                pass
+        return self._snapshot()
+
+    async def _cancel_pending(self):
+
+        # lookup yang masih jalan dibatalkan dan ditunggu, bukan dihancurkan saat loop berhenti
+        current = asyncio.current_task()
+        tasks = [task for task in asyncio.all_tasks() if task is not current]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def close(self):
+
+        if self.loop is not None:
+            if self.loop.is_running():
+                try:
+                    asyncio.run_coroutine_threadsafe(self._cancel_pending(), self.loop).result(timeout=2)
+                except concurrent.futures.TimeoutError:
+                    pass
+                self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join(timeout=2)
+            self.loop.close()
+            self.loop = None
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
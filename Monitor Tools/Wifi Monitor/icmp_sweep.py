@@ -0,0 +1,325 @@
+import os
+import logging
+import platform
+import socket
+import struct
+import asyncio
+import ipaddress
+import subprocess
+import time
+import concurrent.futures
+
+ICMP_ECHO_REQUEST = 8
+ICMP_ECHO_REPLY = 0
+ICMPV6_ECHO_REQUEST = 128
+ICMPV6_ECHO_REPLY = 129
+
+# di atas ukuran ini jaringan IPv6 tidak disapu, cukup tetangga + multicast
+MAX_IPV6_SWEEP = 65536
+# batas yang sama untuk IPv4: lebih besar dari /16 (mis. /8) tidak di-enumerasi
+MAX_IPV4_SWEEP = 65536
+
+logger = logging.getLogger(__name__)
+
+def icmp_checksum(data):
+
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    total = (total >> 16) + (total & 0xffff)
+    total += total >> 16
+    return ~total & 0xffff
+
+def subprocess_ping(ip, timeout=1):
+
+    # jalur lama: satu proses ping per host, dipakai kalau socket ICMP tidak diizinkan
+    start = time.perf_counter()
+    try:
+        if platform.system() == 'Windows':
+            command = ['ping', '-n', '1', '-w', str(int(timeout * 1000)), ip]
+        else:
+            command = ['ping', '-c', '1', '-W', str(max(1, int(timeout))), ip]
+        result = subprocess.run(
+            command,
+            capture_output=True,
+            text=True,
+            timeout=timeout + 1
+        )
+        if result.returncode == 0:
+            return time.perf_counter() - start
+    except (subprocess.TimeoutExpired, OSError):
+        pass
+    return None
+
+def ipv6_neighbours(interface=None):
+
+    command = ['ip', '-6', 'neigh', 'show']
+    if interface:
+        command += ['dev', interface]
+    try:
+        result = subprocess.run(command, capture_output=True, text=True)
+    except OSError:
+        return []
+    neighbours = []
+    for line in result.stdout.split('\n'):
+        parts = line.split()
+        if parts and parts[-1] != 'FAILED':
+            neighbours.append(parts[0])
+    return neighbours
+
+def iter_targets(networks, interface=None):
+
+    # generator: alamat dibuat satu per satu, /16 tidak pernah jadi list penuh
+    multicast_sent = False
+    for network in networks:
+        if network.version == 4:
+            if network.num_addresses > MAX_IPV4_SWEEP:
+                logger.warning(f"Jaringan {network} terlalu besar untuk disapu (maks {MAX_IPV4_SWEEP} alamat), dilewati")
+                continue
+            for ip in network.hosts():
+                yield str(ip)
+            continue
+        if network.num_addresses <= MAX_IPV6_SWEEP:
+            for ip in network.hosts():
+                yield str(ip)
+            continue
+
+        # /64 tidak mungkin disapu: ping all-nodes multicast + tabel tetangga
+        if interface and not multicast_sent:
+            multicast_sent = True
+            yield f"ff02::1%{interface}"
+        for neighbour in ipv6_neighbours(interface):
+            address = ipaddress.ip_address(neighbour.split('%')[0])
+            if address in network:
+                yield neighbour
+
+class IcmpSweeper:
+    def __init__(self, timeout=1.0, rate=1000, burst=32, window=256, fallback_workers=100):
+
+        self.timeout = timeout
+        # pacing: paling banyak "rate" paket per detik, dikirim per burst
+        self.rate = rate
+        self.burst = burst
+        # batas paket yang sedang menunggu balasan, memori tetap datar
+        self.window = window
+        self.fallback_workers = fallback_workers
+        self.identifier = os.getpid() & 0xffff
+        self.mode = None
+
+        self.sent = 0
+        self.received = 0
+
+    def _open_socket(self, family=socket.AF_INET):
+
+        # coba socket ICMP tanpa root dulu (ping_group_range), lalu raw socket
+        proto = socket.IPPROTO_ICMP if family == socket.AF_INET else socket.IPPROTO_ICMPV6
+        try:
+            sock = socket.socket(family, socket.SOCK_DGRAM, proto)
+            self.mode = 'dgram'
+        except OSError:
+            sock = socket.socket(family, socket.SOCK_RAW, proto)
+            self.mode = 'raw'
+        sock.setblocking(False)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        return sock
+
+    def _build_packet(self, sequence, family=socket.AF_INET):
+
+        payload = struct.pack('!d', time.perf_counter()) + b'rexzea-sweep'
+        if family == socket.AF_INET6:
+            # checksum ICMPv6 dihitung kernel (pakai pseudo-header IPv6)
+            return struct.pack('!BBHHH', ICMPV6_ECHO_REQUEST, 0, 0, self.identifier, sequence) + payload
+        header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, 0, self.identifier, sequence)
+        checksum = icmp_checksum(header + payload)
+        header = struct.pack('!BBHHH', ICMP_ECHO_REQUEST, 0, checksum, self.identifier, sequence)
+        return header + payload
+
+    def _parse_reply(self, data, family=socket.AF_INET):
+
+        # raw socket IPv4 menerima header IP, socket dgram dan IPv6 hanya ICMP
+        if self.mode == 'raw' and family == socket.AF_INET:
+            data = data[(data[0] & 0x0f) * 4:]
+        if len(data) < 8:
+            return None
+        icmp_type, _, _, identifier, sequence = struct.unpack('!BBHHH', data[:8])
+        if icmp_type != (ICMP_ECHO_REPLY if family == socket.AF_INET else ICMPV6_ECHO_REPLY):
+            return None
+        # pada socket dgram kernel mengganti identifier, cocokkan lewat sequence saja
+        if self.mode == 'raw' and identifier != self.identifier:
+            return None
+        return identifier, sequence
+
+    async def stream(self, targets):
+
+        # yield (ip, rtt) begitu host membalas, target diambil dari iterator secara bertahap
+        loop = asyncio.get_running_loop()
+        results = asyncio.Queue()
+        slots = asyncio.Semaphore(self.window)
+        sockets = {}
+        pending = {}
+        multicast = {}
+        reported = set()
+        executor = None
+        state = {'outstanding': 0, 'sent_all': False, 'multicast': False, 'error': None}
+
+        def finish(ip, rtt):
+            state['outstanding'] -= 1
+            slots.release()
+            results.put_nowait((ip, rtt))
+
+        def on_readable(sock, family):
+            while True:
+                try:
+                    data, address = sock.recvfrom(2048)
+                except (BlockingIOError, InterruptedError):
+                    return
+                except OSError:
+                    return
+                parsed = self._parse_reply(data, family)
+                if parsed is None:
+                    continue
+                source = address[0].split('%')[0]
+                sequence = parsed[1]
+                entry = pending.pop((source, sequence), None)
+                if entry is not None:
+                    sent_at, handle = entry
+                    handle.cancel()
+                    self.received += 1
+                    finish(source, time.perf_counter() - sent_at)
+                elif sequence in multicast:
+                    # satu ping multicast dibalas banyak host
+                    self.received += 1
+                    results.put_nowait((source, time.perf_counter() - multicast[sequence]))
+
+        def expire(key):
+            if pending.pop(key, None) is not None:
+                finish(key[0], None)
+
+        def expire_multicast(sequence, ip):
+            if multicast.pop(sequence, None) is not None:
+                finish(ip, None)
+
+        def socket_for(family):
+            if family not in sockets:
+                try:
+                    sock = self._open_socket(family)
+                except PermissionError:
+                    sock = None
+                    self.mode = 'subprocess'
+                sockets[family] = sock
+                if sock is not None:
+                    loop.add_reader(sock.fileno(), on_readable, sock, family)
+            return sockets[family]
+
+        async def produce():
+            nonlocal executor
+            interval = self.burst / self.rate if self.rate else 0
+            sequence = 0
+            try:
+                for index, target in enumerate(targets):
+                    await slots.acquire()
+                    state['outstanding'] += 1
+                    ip, _, scope = str(target).partition('%')
+                    try:
+                        address = ipaddress.ip_address(ip)
+                        scope_id = socket.if_nametoindex(scope) if scope else 0
+                    except (ValueError, OSError):
+                        # target rusak / interface scope tidak ada: anggap tidak terjangkau, sweep jalan terus
+                        finish(ip, None)
+                        continue
+                    family = socket.AF_INET6 if address.version == 6 else socket.AF_INET
+                    sock = socket_for(family)
+
+                    if sock is None:
+                        # tanpa izin socket ICMP: ping subprocess lewat thread pool
+                        if executor is None:
+                            executor = concurrent.futures.ThreadPoolExecutor(max_workers=self.fallback_workers)
+                        future = loop.run_in_executor(executor, subprocess_ping, str(target), self.timeout)
+                        future.add_done_callback(
+                            lambda f, ip=ip: finish(ip, None if f.cancelled() or f.exception() else f.result())
+                        )
+                    else:
+                        sequence = (sequence + 1) & 0xffff
+                        destination = (ip, 0)
+                        if family == socket.AF_INET6:
+                            destination = (ip, 0, 0, scope_id)
+                        if address.is_multicast:
+                            state['multicast'] = True
+                            multicast[sequence] = time.perf_counter()
+                            loop.call_later(self.timeout, expire_multicast, sequence, ip)
+                        else:
+                            key = (ip, sequence)
+                            pending[key] = (time.perf_counter(), loop.call_later(self.timeout, expire, key))
+                        try:
+                            sock.sendto(self._build_packet(sequence, family), destination)
+                            self.sent += 1
+                        except OSError:
+                            # host tidak bisa dijangkau sama sekali, selesaikan sekarang
+                            if multicast.pop(sequence, None) is not None:
+                                finish(ip, None)
+                            entry = pending.pop((ip, sequence), None)
+                            if entry is not None:
+                                entry[1].cancel()
+                                finish(ip, None)
+
+                    # jeda antar burst supaya tidak membanjiri jaringan
+                    if interval and (index + 1) % self.burst == 0:
+                        await asyncio.sleep(interval)
+            except Exception as e:
+                # mis. socket gagal dibuka (bukan soal izin): diteruskan ke consumer
+                state['error'] = e
+            finally:
+                # consumer tidak boleh menunggu selamanya
+                state['sent_all'] = True
+                results.put_nowait(None)
+
+        producer = asyncio.ensure_future(produce())
+        try:
+            while not (state['sent_all'] and state['outstanding'] == 0 and results.empty()):
+                item = await results.get()
+                if item is None:
+                    if state['error'] is not None:
+                        raise state['error']
+                    continue
+                ip, rtt = item
+                if rtt is None or ip in reported:
+                    continue
+                # dedup hanya perlu kalau ada ping multicast, unicast sudah unik per host
+                if state['multicast']:
+                    reported.add(ip)
+                yield ip, rtt
+            await producer
+        finally:
+            producer.cancel()
+            for _, handle in pending.values():
+                handle.cancel()
+            for sock in sockets.values():
+                if sock is not None:
+                    loop.remove_reader(sock.fileno())
+                    sock.close()
+            if executor is not None:
+                executor.shutdown(wait=False, cancel_futures=True)
+
+    async def sweep(self, targets):
+
+        # hasil: {ip: rtt dalam detik} untuk host yang membalas
+        return {ip: rtt async for ip, rtt in self.stream(targets)}
+
+    def sweep_sync(self, targets):
+
+        return asyncio.run(self.sweep(targets))
+
+    def iter_sweep(self, targets):
+
+        # versi generator biasa untuk scanner yang berbasis thread
+        loop = asyncio.new_event_loop()
+        agen = self.stream(targets)
+        try:
+            while True:
+                try:
+                    yield loop.run_until_complete(agen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            loop.run_until_complete(agen.aclose())
+            loop.close()
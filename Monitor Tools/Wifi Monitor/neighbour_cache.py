@@ -0,0 +1,158 @@
+import os
+import re
+import json
+import time
+import platform
+import subprocess
+import threading
+from collections import namedtuple
+
+# penanda eksplisit: host aktif tapi MAC-nya tidak ada di tabel tetangga
+UNRESOLVED = 'Unresolved'
+
+NeighbourEntry = namedtuple('NeighbourEntry', ['mac', 'state', 'device'])
+
+# flag ATF_COM di /proc/net/arp: entri sudah lengkap
+ATF_COM = 0x2
+
+MAC_PATTERN = re.compile(r'([0-9a-fA-F]{1,2}[:-]){5}[0-9a-fA-F]{1,2}')
+IP_PATTERN = re.compile(r'\(?(\d{1,3}(?:\.\d{1,3}){3})\)?')
+
+def _normalise_mac(mac):
+
+    return ':'.join(part.zfill(2) for part in re.split('[:-]', mac.lower()))
+
+class NeighbourCache:
+    def __init__(self, ttl=30.0, miss_refresh=1.0, proc_root='/proc', os_type=None):
+
+        self.ttl = ttl
+        # kalau IP belum ada, boleh baca ulang tabel paling cepat tiap miss_refresh detik
+        self.miss_refresh = miss_refresh
+        self.proc_root = proc_root
+        self.os_type = os_type or platform.system()
+
+        self.lock = threading.Lock()
+        self.entries = {}
+        self.ipv6_loaded = False
+        self.loaded_at = 0.0
+
+        self.refreshes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _read_proc_arp(self):
+
+        entries = {}
+        with open(os.path.join(self.proc_root, 'net', 'arp')) as f:
+            next(f, None)
+            for line in f:
+                parts = line.split()
+                if len(parts) < 6:
+                    continue
+                flags = int(parts[2], 16)
+                # flag 0x0 berarti ARP belum dijawab (incomplete)
+                if flags & ATF_COM and parts[3] != '00:00:00:00:00:00':
+                    entries[parts[0]] = NeighbourEntry(parts[3].lower(), 'REACHABLE', parts[5])
+                else:
+                    entries[parts[0]] = NeighbourEntry(None, 'INCOMPLETE', parts[5])
+        return entries
+
+    def _read_ip_json(self, family=None):
+
+        command = ['ip', '-j']
+        if family:
+            command.append(family)
+        result = subprocess.run(command + ['neigh', 'show'], capture_output=True, text=True)
+        entries = {}
+        for item in json.loads(result.stdout or '[]'):
+            state = (item.get('state') or ['UNKNOWN'])[0]
+            mac = item.get('lladdr')
+            entries[item['dst']] = NeighbourEntry(mac.lower() if mac and state != 'FAILED' else None, state, item.get('dev'))
+        return entries
+
+    def _read_arp_command(self):
+
+        # windows: "192.168.1.1  aa-bb-cc-dd-ee-ff  dynamic", macOS: "? (192.168.1.1) at aa:bb:... on en0"
+        command = ['arp', '-a'] if self.os_type == 'Windows' else ['arp', '-an']
+        result = subprocess.run(command, capture_output=True, text=True)
+        entries = {}
+        for line in result.stdout.split('\n'):
+            ip_match = IP_PATTERN.search(line)
+            if not ip_match or line.startswith('Interface'):
+                continue
+            mac_match = MAC_PATTERN.search(line)
+            if mac_match:
+                entries[ip_match.group(1)] = NeighbourEntry(_normalise_mac(mac_match.group(0)), 'REACHABLE', None)
+            else:
+                entries[ip_match.group(1)] = NeighbourEntry(None, 'INCOMPLETE', None)
+        return entries
+
+    def refresh(self):
+
+        # satu kali baca seluruh tabel, bukan satu subprocess per host
+        try:
+            if self.os_type == 'Linux':
+                try:
+                    entries = self._read_proc_arp()
+                except OSError:
+                    entries = self._read_ip_json()
+            else:
+                entries = self._read_arp_command()
+        except (OSError, ValueError):
+            entries = {}
+
+        with self.lock:
+            self.entries = entries
+            self.ipv6_loaded = False
+            self.loaded_at = time.monotonic()
+            self.refreshes += 1
+
+    def _load_ipv6(self):
+
+        # /proc/net/arp hanya IPv4, tetangga IPv6 diambil sekali lewat ip -j -6
+        try:
+            entries = self._read_ip_json('-6')
+        except (OSError, ValueError):
+            entries = {}
+        with self.lock:
+            self.entries.update(entries)
+            self.ipv6_loaded = True
+
+    def _find(self, ip):
+
+        if ':' in ip and not self.ipv6_loaded and self.os_type == 'Linux':
+            self._load_ipv6()
+        return self.entries.get(ip)
+
+    def get_entry(self, ip):
+
+        ip = ip.split('%')[0]
+        if time.monotonic() - self.loaded_at > self.ttl:
+            self.refresh()
+        entry = self._find(ip)
+        if entry is None and time.monotonic() - self.loaded_at > self.miss_refresh:
+            # host baru saja membalas ping, mungkin belum ada saat tabel terakhir dibaca
+            self.refresh()
+            entry = self._find(ip)
+
+        if entry is not None and entry.mac:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return entry
+
+    def lookup(self, ip):
+
+        entry = self.get_entry(ip)
+        if entry is None or not entry.mac:
+            return UNRESOLVED
+        return entry.mac
+
+    def get_stats(self):
+
+        return {
+            'entries': len(self.entries),
+            'refreshes': self.refreshes,
+            'hits': self.hits,
+            'misses': self.misses
+        }
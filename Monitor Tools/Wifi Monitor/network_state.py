@@ -0,0 +1,315 @@
+import os
+import re
+import select
+import socket
+import struct
+import zlib
+import ipaddress
+import platform
+import subprocess
+import threading
+from collections import namedtuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+NetworkState = namedtuple(
+    'NetworkState',
+    ['local_ip', 'interface', 'network', 'gateway', 'networks', 'gateways', 'version']
+)
+
+# grup multicast rtnetlink: link, alamat IPv4/IPv6, route IPv4/IPv6
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV4_ROUTE = 0x40
+RTMGRP_IPV6_IFADDR = 0x100
+RTMGRP_IPV6_ROUTE = 0x400
+NETLINK_GROUPS = RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV4_ROUTE | RTMGRP_IPV6_IFADDR | RTMGRP_IPV6_ROUTE
+
+def _hex_ipv4(value):
+
+    # /proc/net/route menyimpan alamat little-endian dalam hex
+    return socket.inet_ntoa(struct.pack('<I', int(value, 16)))
+
+def read_routes(proc_root='/proc'):
+
+    # [(iface, network, gateway atau None)]
+    routes = []
+    with open(os.path.join(proc_root, 'net', 'route')) as f:
+        next(f, None)
+        for line in f:
+            fields = line.split()
+            if len(fields) < 8:
+                continue
+            flags = int(fields[3], 16)
+            # RTF_UP = 0x1, RTF_GATEWAY = 0x2
+            if not flags & 0x1:
+                continue
+            network = ipaddress.ip_network(f"{_hex_ipv4(fields[1])}/{_hex_ipv4(fields[7])}", strict=False)
+            gateway = _hex_ipv4(fields[2]) if flags & 0x2 else None
+            routes.append((fields[0], network, gateway))
+    return routes
+
+def read_fib_local_addresses(proc_root='/proc'):
+
+    # alamat "/32 host LOCAL" di /proc/net/fib_trie = alamat IPv4 milik host ini
+    addresses = []
+    current = None
+    with open(os.path.join(proc_root, 'net', 'fib_trie')) as f:
+        for line in f:
+            stripped = line.strip()
+            if stripped.startswith('|--'):
+                current = stripped[3:].strip()
+            elif stripped.startswith('/32 host LOCAL') and current and current not in addresses:
+                addresses.append(current)
+    return addresses
+
+def read_proc_addresses(proc_root='/proc'):
+
+    # tanpa psutil: IPv4 dari fib_trie + tabel route, IPv6 dari if_inet6
+    interfaces = {}
+    routes = read_routes(proc_root)
+    for address in read_fib_local_addresses(proc_root):
+        ip = ipaddress.ip_address(address)
+        if ip.is_loopback:
+            continue
+        # prefix = route link (tanpa gateway) terpanjang yang memuat alamat ini
+        links = [(network, iface) for iface, network, gateway in routes if gateway is None and ip in network]
+        if links:
+            network, iface = max(links, key=lambda item: item[0].prefixlen)
+            interfaces.setdefault(iface, []).append(ipaddress.ip_interface(f"{ip}/{network.prefixlen}"))
+
+    try:
+        with open(os.path.join(proc_root, 'net', 'if_inet6')) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 6:
+                    continue
+                address = ':'.join(fields[0][i:i + 4] for i in range(0, 32, 4))
+                interfaces.setdefault(fields[5], []).append(
+                    ipaddress.ip_interface(f"{address}/{int(fields[2], 16)}")
+                )
+    except OSError:
+        pass
+    return interfaces
+
+def read_interface_addresses(proc_root='/proc'):
+
+    # {iface: [ip_interface, ...]}
+    if psutil is not None:
+        interfaces = {}
+        for name, addrs in psutil.net_if_addrs().items():
+            for addr in addrs:
+                if addr.family in (socket.AF_INET, socket.AF_INET6) and addr.netmask:
+                    address = addr.address.split('%')[0]
+                    prefix = bin(int(ipaddress.ip_address(addr.netmask.split('%')[0]))).count('1')
+                    interfaces.setdefault(name, []).append(ipaddress.ip_interface(f"{address}/{prefix}"))
+        return interfaces
+    if os.path.exists(os.path.join(proc_root, 'net', 'fib_trie')):
+        return read_proc_addresses(proc_root)
+
+    interfaces = {}
+    try:
+        result = subprocess.run(['ip', '-o', 'addr', 'show'], capture_output=True, text=True)
+        for line in result.stdout.split('\n'):
+            parts = line.split()
+            if len(parts) >= 4 and parts[2] in ('inet', 'inet6'):
+                interfaces.setdefault(parts[1], []).append(ipaddress.ip_interface(parts[3]))
+    except OSError:
+        pass
+    return interfaces
+
+def read_command_gateways(os_type=None):
+
+    # windows / macOS tidak punya /proc/net/route
+    os_type = os_type or platform.system()
+    try:
+        if os_type == 'Windows':
+            output = subprocess.run(['ipconfig'], capture_output=True, text=True).stdout
+            return [gateway for gateway in re.findall(r'Default Gateway[ .]*:\s*([0-9.]+)', output) if gateway != '0.0.0.0']
+        output = subprocess.run(['netstat', '-rn'], capture_output=True, text=True).stdout
+        return [line.split()[1] for line in output.split('\n')
+                if line.startswith('default') and len(line.split()) > 1 and '.' in line.split()[1]]
+    except OSError:
+        return []
+
+class NetworkStateService:
+    def __init__(self, proc_root='/proc', poll_interval=2.0, use_netlink=True):
+
+        self.proc_root = proc_root
+        self.poll_interval = poll_interval
+        self.use_netlink = use_netlink
+        self.lock = threading.Lock()
+        self.state = None
+        self.dirty = True
+        self.version = 0
+        self.checksum = None
+        self.netlink = None
+        self.last_poll = 0.0
+
+        self.stop_event = threading.Event()
+        self.thread = None
+        self.stats = {'reads': 0, 'invalidations': 0, 'netlink_events': 0}
+
+    def _compute_checksum(self):
+
+        # checksum murah: isi tabel route + daftar alamat, hanya dipakai kalau netlink tidak ada
+        checksum = 0
+        for name in ('route', 'if_inet6'):
+            try:
+                with open(os.path.join(self.proc_root, 'net', name), 'rb') as f:
+                    checksum = zlib.crc32(f.read(), checksum)
+            except OSError:
+                pass
+        if psutil is not None and not os.path.exists(os.path.join(self.proc_root, 'net', 'route')):
+            checksum = zlib.crc32(repr(sorted(psutil.net_if_addrs().items())).encode(), checksum)
+        return checksum
+
+    def _read_state(self):
+
+        self.stats['reads'] += 1
+        interfaces = read_interface_addresses(self.proc_root)
+        try:
+            routes = read_routes(self.proc_root)
+        except OSError:
+            routes = []
+
+        default_routes = [(iface, gateway) for iface, network, gateway in routes if network.prefixlen == 0 and gateway]
+        gateways = [gateway for _, gateway in default_routes]
+        if not routes:
+            gateways = read_command_gateways()
+
+        # interface utama: yang punya default route, kalau offline interface non-loopback pertama
+        interface = default_routes[0][0] if default_routes else None
+        if interface is None and gateways:
+            gateway = ipaddress.ip_address(gateways[0])
+            interface = next((name for name, addresses in interfaces.items()
+                              if any(gateway in address.network for address in addresses)), None)
+        if interface is None:
+            interface = next((name for name, addresses in interfaces.items()
+                              if any(address.version == 4 and not address.ip.is_loopback for address in addresses)), None)
+
+        addresses = [address for address in interfaces.get(interface, []) if not address.ip.is_loopback]
+        ipv4 = [address for address in addresses if address.version == 4]
+        primary = ipv4[0] if ipv4 else None
+
+        networks = [address.network for address in addresses]
+        # jaringan milik IP utama didahulukan
+        if primary is not None:
+            networks.sort(key=lambda network: primary.ip not in network)
+
+        # tanpa interface yang bisa dipakai: networks kosong, scanner melewati sweep
+        return NetworkState(
+            local_ip=str(primary.ip) if primary else '127.0.0.1',
+            interface=interface,
+            network=primary.network if primary else None,
+            gateway=gateways[0] if gateways else None,
+            networks=networks,
+            gateways=gateways,
+            version=self.version
+        )
+
+    def _open_netlink(self):
+
+        if not self.use_netlink or not hasattr(socket, 'AF_NETLINK'):
+            return None
+        try:
+            sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        except OSError:
+            return None
+        try:
+            sock.bind((0, NETLINK_GROUPS))
+            sock.setblocking(False)
+            return sock
+        except OSError:
+            # socket sudah terbuka, tutup dulu supaya fd tidak bocor
+            sock.close()
+            return None
+
+    def invalidate(self):
+
+        with self.lock:
+            self.dirty = True
+            self.stats['invalidations'] += 1
+
+    def _watch(self):
+
+        while not self.stop_event.is_set():
+            if self.netlink is not None:
+                # notifikasi rtnetlink: link/alamat/route berubah
+                readable, _, _ = select.select([self.netlink], [], [], 1.0)
+                if readable:
+                    try:
+                        while self.netlink.recv(65536):
+                            self.stats['netlink_events'] += 1
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                    except OSError:
+                        # netlink rusak: tutup lalu lanjut dengan polling
+                        self.netlink.close()
+                        self.netlink = None
+                    self.invalidate()
+            else:
+                if self.stop_event.wait(self.poll_interval):
+                    return
+                self.poll()
+
+    def poll(self):
+
+        checksum = self._compute_checksum()
+        if checksum != self.checksum:
+            self.checksum = checksum
+            self.invalidate()
+
+    def start(self):
+
+        if self.thread is None:
+            self.netlink = self._open_netlink()
+            self.checksum = self._compute_checksum()
+            self.thread = threading.Thread(target=self._watch, daemon=True)
+            self.thread.start()
+        return self
+
+    def get(self):
+
+        # dibaca ulang hanya kalau ada perubahan, selain itu langsung dari memori
+        with self.lock:
+            if not self.dirty and self.state is not None:
+                return self.state
+            self.dirty = False
+            self.version += 1
+        state = self._read_state()
+        with self.lock:
+            self.state = state
+        return state
+
+    def get_stats(self):
+
+        stats = dict(self.stats)
+        stats['mode'] = 'netlink' if self.netlink is not None else 'polling'
+        stats['version'] = self.version
+        return stats
+
+    def stop(self):
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        if self.netlink is not None:
+            self.netlink.close()
+            self.netlink = None
+
+_shared_service = None
+_shared_lock = threading.Lock()
+
+def get_network_state():
+
+    # satu service dipakai bersama oleh semua scanner dalam proses yang sama
+    global _shared_service
+    with _shared_lock:
+        if _shared_service is None:
+            _shared_service = NetworkStateService().start()
+    return _shared_service.get()
@@ -0,0 +1,307 @@
+import os
+import socket
+import struct
+import statistics
+import threading
+import socketserver
+import time
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# header perintah: 1 byte perintah + durasi (ms) / jumlah
+HEADER = struct.Struct('!cI')
+# laporan upload dari server: byte setelah warm-up + lama jendela ukur (mikrodetik)
+UPLOAD_REPORT = struct.Struct('!QQ')
+CMD_PING = b'P'
+CMD_DOWNLOAD = b'D'
+CMD_UPLOAD = b'U'
+CHUNK_SIZE = 64 * 1024
+
+class _ThroughputHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+
+        sock = self.request
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        header = self._recv_exact(HEADER.size)
+        if header is None:
+            return
+        command, value = HEADER.unpack(header)
+
+        if command == CMD_PING:
+            # echo 1 byte sampai client menutup koneksi
+            while True:
+                data = sock.recv(1)
+                if not data:
+                    return
+                sock.sendall(data)
+
+        elif command == CMD_DOWNLOAD:
+            payload = bytes(CHUNK_SIZE)
+            deadline = time.monotonic() + value / 1000
+            try:
+                while time.monotonic() < deadline:
+                    sock.sendall(payload)
+            except OSError:
+                pass
+
+        elif command == CMD_UPLOAD:
+            # hitung byte sampai EOF, byte selama warm-up (value ms) tidak dihitung
+            buffer = bytearray(CHUNK_SIZE)
+            warmup_end = time.monotonic() + value / 1000
+            counted = 0
+            while True:
+                received = sock.recv_into(buffer)
+                if not received:
+                    break
+                if time.monotonic() >= warmup_end:
+                    counted += received
+            window = max(0.0, time.monotonic() - warmup_end)
+            sock.sendall(UPLOAD_REPORT.pack(counted, int(window * 1e6)))
+
+    def _recv_exact(self, size):
+
+        data = b''
+        while len(data) < size:
+            chunk = self.request.recv(size - len(data))
+            if not chunk:
+                return None
+            data += chunk
+        return data
+
+class _ThreadingServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+class ThroughputServer:
+    def __init__(self, host='127.0.0.1', port=0):
+
+        # server pengganti lokal untuk testing tes kecepatan tanpa internet
+        self.server = _ThreadingServer((host, port), _ThroughputHandler)
+        self.thread = None
+
+    @property
+    def address(self):
+
+        return self.server.server_address[:2]
+
+    def start(self):
+
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+class ActiveThroughputTest:
+    def __init__(self, host, port, streams=4, duration=3.0, warmup=0.5, ping_count=10, timeout=5.0):
+
+        self.host = host
+        self.port = port
+        # beberapa stream TCP paralel supaya satu koneksi tidak membatasi hasil
+        self.streams = streams
+        self.duration = duration
+        # byte selama slow-start tidak dihitung ke goodput
+        self.warmup = min(warmup, duration / 2)
+        self.ping_count = ping_count
+        self.timeout = timeout
+
+    def _connect(self, command, value):
+
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.sendall(HEADER.pack(command, int(value)))
+        return sock
+
+    def measure_rtt(self):
+
+        samples = []
+        with self._connect(CMD_PING, 0) as sock:
+            for _ in range(self.ping_count):
+                start = time.perf_counter()
+                sock.sendall(b'x')
+                if not sock.recv(1):
+                    break
+                samples.append((time.perf_counter() - start) * 1000)
+        if not samples:
+            return None, None
+        # jitter = rata-rata selisih RTT berturut-turut (gaya RFC 3550)
+        jitter = statistics.mean(abs(b - a) for a, b in zip(samples, samples[1:])) if len(samples) > 1 else 0.0
+        return statistics.mean(samples), jitter
+
+    def _download_stream(self, results, index):
+
+        buffer = bytearray(CHUNK_SIZE)
+        counted = 0
+        with self._connect(CMD_DOWNLOAD, self.duration * 1000) as sock:
+            start = time.monotonic()
+            while True:
+                received = sock.recv_into(buffer)
+                if not received:
+                    break
+                if time.monotonic() - start >= self.warmup:
+                    counted += received
+        results[index] = counted
+
+    def _upload_stream(self, results, index):
+
+        payload = bytes(CHUNK_SIZE)
+        with self._connect(CMD_UPLOAD, self.warmup * 1000) as sock:
+            deadline = time.monotonic() + self.duration
+            while time.monotonic() < deadline:
+                sock.sendall(payload)
+            sock.shutdown(socket.SHUT_WR)
+            report = b''
+            while len(report) < UPLOAD_REPORT.size:
+                chunk = sock.recv(UPLOAD_REPORT.size - len(report))
+                if not chunk:
+                    raise ConnectionError("Laporan upload dari server tidak lengkap")
+                report += chunk
+        # pakai jumlah yang benar-benar diterima server setelah warm-up, bukan yang dikirim
+        counted, window_us = UPLOAD_REPORT.unpack(report)
+        results[index] = (counted, window_us / 1e6)
+
+    def _stream(self, target, results, errors, index):
+
+        try:
+            target(results, index)
+        except Exception as e:
+            errors[index] = e
+
+    def _run_parallel(self, target):
+
+        results = [None] * self.streams
+        errors = [None] * self.streams
+        threads = [
+            threading.Thread(target=self._stream, args=(target, results, errors, i), daemon=True)
+            for i in range(self.streams)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(self.duration + self.timeout)
+
+        # stream gagal dicatat terpisah, bukan dihitung sebagai 0 byte
+        failed = [
+            f"stream {index}: {errors[index] or 'timeout'}"
+            for index, result in enumerate(results) if result is None
+        ]
+        return [result for result in results if result is not None], failed
+
+    def run(self):
+
+        rtt_ms, jitter_ms = self.measure_rtt()
+        downloaded, download_failed = self._run_parallel(self._download_stream)
+        uploaded, upload_failed = self._run_parallel(self._upload_stream)
+
+        download_window = self.duration - self.warmup
+        download_mbps = round(sum(downloaded) * 8 / download_window / 1e6, 2) if downloaded else None
+        # upload: goodput tiap stream dari jendela ukur server (tanpa warm-up), lalu dijumlah
+        upload_mbps = round(
+            sum(counted * 8 / window for counted, window in uploaded if window > 0) / 1e6, 2
+        ) if uploaded else None
+        return {
+            'download_mbps': download_mbps,
+            'upload_mbps': upload_mbps,
+            'rtt_ms': round(rtt_ms, 3) if rtt_ms is not None else None,
+            'jitter_ms': round(jitter_ms, 3) if jitter_ms is not None else None,
+            'streams': self.streams,
+            'failed_streams': {'download': len(download_failed), 'upload': len(upload_failed)},
+            'errors': download_failed + upload_failed,
+            'measured_at': time.time()
+        }
+
+def read_interface_counters(proc_root='/proc'):
+
+    # {iface: (rx_bytes, tx_bytes, rx_packets, tx_packets)}
+    path = os.path.join(proc_root, 'net', 'dev')
+    if os.path.exists(path):
+        counters = {}
+        with open(path) as f:
+            for line in f.readlines()[2:]:
+                name, _, data = line.partition(':')
+                fields = data.split()
+                if len(fields) >= 10:
+                    counters[name.strip()] = (int(fields[0]), int(fields[8]), int(fields[1]), int(fields[9]))
+        return counters
+    if psutil is not None:
+        return {
+            name: (io.bytes_recv, io.bytes_sent, io.packets_recv, io.packets_sent)
+            for name, io in psutil.net_io_counters(pernic=True).items()
+        }
+    return {}
+
+class PassiveThroughputMonitor:
+    def __init__(self, resolution=0.5, proc_root='/proc'):
+
+        # laju rx/tx per interface dari selisih counter, tanpa trafik tambahan
+        self.resolution = resolution
+        self.proc_root = proc_root
+        self.lock = threading.Lock()
+        self.previous = None
+        self.previous_time = None
+        self.latest = {}
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def sample(self):
+
+        now = time.monotonic()
+        counters = read_interface_counters(self.proc_root)
+        if self.previous is not None:
+            elapsed = now - self.previous_time
+            rates = {}
+            for name, values in counters.items():
+                before = self.previous.get(name)
+                if before is None or elapsed <= 0:
+                    continue
+                deltas = [after - prior for after, prior in zip(values, before)]
+                # counter reset (interface naik ulang), lewati satu sampel
+                if any(delta < 0 for delta in deltas):
+                    continue
+                rates[name] = {
+                    'rx_mbps': round(deltas[0] * 8 / elapsed / 1e6, 3),
+                    'tx_mbps': round(deltas[1] * 8 / elapsed / 1e6, 3),
+                    'rx_pps': round(deltas[2] / elapsed, 1),
+                    'tx_pps': round(deltas[3] / elapsed, 1)
+                }
+            with self.lock:
+                self.latest = rates
+        self.previous = counters
+        self.previous_time = now
+        return self.latest
+
+    def _run(self):
+
+        while not self.stop_event.wait(self.resolution):
+            try:
+                self.sample()
+            except OSError:
+                pass
+
+    def start(self):
+
+        if self.thread is None:
+            self.sample()
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def rates(self, interface=None):
+
+        with self.lock:
+            if interface is not None:
+                return dict(self.latest.get(interface, {}))
+            return {name: dict(rate) for name, rate in self.latest.items()}
+
+    def stop(self):
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
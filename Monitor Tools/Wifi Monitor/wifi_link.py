@@ -0,0 +1,224 @@
+import os
+import sys
+import re
+import subprocess
+import threading
+import time
+from collections import deque, namedtuple
+
+# modul bersama antar tool (proc_file, ...) ada di folder Monitor Tools
+SHARED_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
+from proc_file import ProcFile
+
+LinkSample = namedtuple('LinkSample', ['timestamp', 'quality', 'signal_dbm', 'noise_dbm', 'status'])
+
+# nilai noise -256 di /proc/net/wireless artinya driver tidak melaporkan noise
+NOISE_UNAVAILABLE = -256
+# skala link quality yang umum dipakai driver (mis. 70/70)
+DEFAULT_MAX_QUALITY = 70
+
+def parse_proc_wireless(data):
+
+    # {iface: (status, quality, level_dbm, noise_dbm)}
+    links = {}
+    for line in bytes(data).decode('ascii', 'replace').split('\n')[2:]:
+        name, _, rest = line.partition(':')
+        fields = rest.split()
+        if len(fields) < 4:
+            continue
+        links[name.strip()] = (
+            int(fields[0], 16),
+            float(fields[1].rstrip('.')),
+            float(fields[2].rstrip('.')),
+            float(fields[3].rstrip('.'))
+        )
+    return links
+
+def parse_iw_link(text):
+
+    # output "iw dev <iface> link"
+    if not text.strip() or text.startswith('Not connected'):
+        return {'connected': False}
+    info = {'connected': True}
+    match = re.search(r'Connected to ([0-9a-fA-F:]{17})', text)
+    if match:
+        info['bssid'] = match.group(1).lower()
+    for line in text.split('\n'):
+        key, _, value = line.strip().partition(':')
+        value = value.strip()
+        if key == 'SSID':
+            info['ssid'] = value
+        elif key == 'freq':
+            info['freq_mhz'] = float(value)
+        elif key == 'signal':
+            info['signal_dbm'] = float(value.split()[0])
+        elif key in ('rx bitrate', 'tx bitrate'):
+            info[key.replace(' ', '_') + '_mbps'] = float(value.split()[0])
+    return info
+
+def run_iw_link(interface):
+
+    try:
+        return subprocess.run(['iw', 'dev', interface, 'link'], capture_output=True, text=True, timeout=2).stdout
+    except (OSError, subprocess.TimeoutExpired):
+        return ''
+
+def find_wireless_interface(sysfs_root='/sys', proc_root='/proc'):
+
+    net_root = os.path.join(sysfs_root, 'class', 'net')
+    try:
+        for name in sorted(os.listdir(net_root)):
+            if os.path.isdir(os.path.join(net_root, name, 'wireless')):
+                return name
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(proc_root, 'net', 'wireless'), 'rb') as f:
+            links = parse_proc_wireless(f.read())
+        return next(iter(links), None)
+    except OSError:
+        return None
+
+class WifiLinkSampler:
+    def __init__(self, interface=None, rate_hz=10, history_seconds=600, proc_root='/proc',
+                 sysfs_root='/sys', max_quality=DEFAULT_MAX_QUALITY,
+                 iw_runner=run_iw_link):
+
+        self.interface = interface or find_wireless_interface(sysfs_root, proc_root)
+        self.period = 1.0 / rate_hz
+        self.max_quality = max_quality
+        self.iw_runner = iw_runner
+
+        # handle file tetap terbuka, tiap sampel cukup satu pread
+        self.wireless = ProcFile(os.path.join(proc_root, 'net', 'wireless'), size=4096)
+        net_dir = os.path.join(sysfs_root, 'class', 'net', self.interface or '')
+        self.operstate = self._open_optional(os.path.join(net_dir, 'operstate'))
+        self.carrier_changes = self._open_optional(os.path.join(net_dir, 'carrier_changes'))
+
+        self.lock = threading.Lock()
+        history = max(1, int(history_seconds * rate_hz))
+        self.series = {
+            'quality': deque(maxlen=history),
+            'signal_dbm': deque(maxlen=history),
+            'noise_dbm': deque(maxlen=history),
+        }
+        self.last_sample = None
+        self.link = {}
+        self.link_key = None
+        self.iw_calls = 0
+
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def _open_optional(self, path):
+
+        try:
+            return ProcFile(path, size=64)
+        except OSError:
+            return None
+
+    def _read_text(self, proc_file):
+
+        if proc_file is None:
+            return None
+        return bytes(proc_file.read()).decode('ascii', 'replace').strip()
+
+    def _link_changed(self):
+
+        # iw hanya dipanggil ulang kalau operstate / carrier_changes berubah
+        key = (self._read_text(self.operstate), self._read_text(self.carrier_changes))
+        if key == self.link_key:
+            return False
+        self.link_key = key
+        return True
+
+    def refresh_link(self):
+
+        self.iw_calls += 1
+        info = parse_iw_link(self.iw_runner(self.interface)) if self.interface else {'connected': False}
+        with self.lock:
+            self.link = info
+        return info
+
+    def sample(self):
+
+        if self._link_changed():
+            self.refresh_link()
+
+        links = parse_proc_wireless(self.wireless.read())
+        values = links.get(self.interface)
+        if values is None:
+            return None
+        status, quality, level, noise = values
+        sample = LinkSample(
+            time.time(),
+            round(min(100.0, quality / self.max_quality * 100), 1),
+            level,
+            None if noise <= NOISE_UNAVAILABLE else noise,
+            status
+        )
+        with self.lock:
+            self.last_sample = sample
+            self.series['quality'].append((sample.timestamp, sample.quality))
+            self.series['signal_dbm'].append((sample.timestamp, sample.signal_dbm))
+            if sample.noise_dbm is not None:
+                self.series['noise_dbm'].append((sample.timestamp, sample.noise_dbm))
+        return sample
+
+    def _run(self):
+
+        next_tick = time.monotonic()
+        while not self.stop_event.is_set():
+            try:
+                self.sample()
+            except OSError:
+                pass
+            # jadwal tetap, tidak menumpuk drift
+            next_tick += self.period
+            self.stop_event.wait(max(0.0, next_tick - time.monotonic()))
+
+    def start(self):
+
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        return self
+
+    def latest(self):
+
+        with self.lock:
+            info = dict(self.link)
+            if self.last_sample is not None:
+                info.update(self.last_sample._asdict())
+        info['interface'] = self.interface
+        return info
+
+    def window(self, name, seconds):
+
+        cutoff = time.time() - seconds
+        with self.lock:
+            return [point for point in self.series[name] if point[0] >= cutoff]
+
+    def stats(self, name, seconds=60):
+
+        values = [value for _, value in self.window(name, seconds)]
+        if not values:
+            return None
+        return {
+            'min': min(values),
+            'max': max(values),
+            'avg': round(sum(values) / len(values), 2),
+            'count': len(values)
+        }
+
+    def stop(self):
+
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        for proc_file in (self.wireless, self.operstate, self.carrier_changes):
+            if proc_file is not None:
+                proc_file.close()
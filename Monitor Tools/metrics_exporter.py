@@ -0,0 +1,396 @@
+import sys
+import math
+import time
+import threading
+import statistics
+import http.client
+from collections import OrderedDict, namedtuple
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Tuple
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+OPENMETRICS_CONTENT_TYPE = 'application/openmetrics-text; version=1.0.0; charset=utf-8'
+
+# label value dipotong supaya nama proses yang aneh tidak membengkakkan output
+MAX_LABEL_LENGTH = 64
+# series di luar batas kardinalitas digabung ke satu series ini
+OVERFLOW_LABEL = 'other'
+
+def escape_label(value) -> str:
+
+    text = str(value)[:MAX_LABEL_LENGTH]
+    return text.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_value(value) -> str:
+
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, int):
+        return str(value)
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value))
+
+class MetricFamily:
+    def __init__(self, name, kind, help_text, labels=(), max_series=64):
+
+        # name tanpa akhiran _total, counter diberi _total saat render
+        self.name = name
+        self.kind = kind
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        # batas kardinalitas per family
+        self.max_series = max_series
+        self.samples: Dict[Tuple, float] = {}
+        # counter: series yang sudah masuk "other" tetap di sana, nilai terakhirnya diingat
+        self.overflowed: Dict[Tuple, float] = {}
+
+    def _set_counter(self, samples):
+
+        # anggota series counter tidak boleh berpindah antar render, kalau tidak "other" bisa turun
+        overflow = (OVERFLOW_LABEL,) * len(self.labels)
+        kept = {}
+        fresh = []
+        for key, value in samples.items():
+            if key in self.overflowed:
+                self.overflowed[key] = value
+            elif key in self.samples:
+                kept[key] = value
+            else:
+                fresh.append((key, value))
+        for key, value in sorted(fresh, key=lambda item: item[1], reverse=True):
+            if len(kept) < self.max_series - 1 or (not self.overflowed and len(kept) + len(fresh) <= self.max_series):
+                kept[key] = value
+            else:
+                self.overflowed[key] = value
+        if self.overflowed:
+            kept[overflow] = sum(self.overflowed.values())
+        self.samples = kept
+
+    def set(self, samples: Dict[Tuple, float], merge=False):
+
+        if merge:
+            samples = {**self.samples, **samples}
+        samples = {tuple(str(value) for value in key): value
+                   for key, value in samples.items() if value is not None}
+        if self.kind == 'counter':
+            self._set_counter(samples)
+            return
+        if len(samples) > self.max_series:
+            # simpan series terbesar, sisanya dijumlah ke label "other"
+            ranked = sorted(samples.items(), key=lambda item: item[1], reverse=True)
+            kept = dict(ranked[:self.max_series - 1])
+            overflow = (OVERFLOW_LABEL,) * len(self.labels)
+            kept[overflow] = kept.get(overflow, 0) + sum(value for _, value in ranked[self.max_series - 1:])
+            samples = kept
+        self.samples = samples
+
+    def render(self, openmetrics=False) -> str:
+
+        if not self.samples:
+            return ''
+        sample_name = self.name + '_total' if self.kind == 'counter' else self.name
+        # OpenMetrics: TYPE pakai nama family, format lama pakai nama sample
+        type_name = self.name if openmetrics else sample_name
+        lines = [f"# HELP {type_name} {self.help_text}", f"# TYPE {type_name} {self.kind}"]
+        for key, value in self.samples.items():
+            if self.labels:
+                labels = ','.join(f'{label}="{escape_label(item)}"' for label, item in zip(self.labels, key))
+                lines.append(f"{sample_name}{{{labels}}} {format_value(value)}")
+            else:
+                lines.append(f"{sample_name} {format_value(value)}")
+        return '\n'.join(lines) + '\n'
+
+class MetricsRegistry:
+    def __init__(self):
+
+        self.families: Dict[str, MetricFamily] = OrderedDict()
+        self.lock = threading.Lock()
+        # output yang sudah dirender, scrape hanya mengirim bytes ini
+        self.rendered = {False: b'', True: b'# EOF\n'}
+        self.stats = {'renders': 0, 'last_render_seconds': 0.0, 'scrapes': 0}
+
+    def family(self, name, kind, help_text, labels=(), max_series=64) -> MetricFamily:
+
+        with self.lock:
+            if name not in self.families:
+                self.families[name] = MetricFamily(name, kind, help_text, labels, max_series)
+            return self.families[name]
+
+    def set(self, name, samples: Dict[Tuple, float], merge=False):
+
+        with self.lock:
+            self.families[name].set(samples, merge)
+
+    def set_value(self, name, value):
+
+        self.set(name, {(): value})
+
+    def render(self):
+
+        # dirender saat sampel baru datang, bukan saat di-scrape
+        start = time.perf_counter()
+        with self.lock:
+            families = list(self.families.values())
+            prometheus = ''.join(family.render() for family in families)
+            openmetrics = ''.join(family.render(openmetrics=True) for family in families) + '# EOF\n'
+        # ganti referensi sekaligus, handler tidak perlu lock
+        self.rendered = {False: prometheus.encode(), True: openmetrics.encode()}
+        self.stats['renders'] += 1
+        self.stats['last_render_seconds'] = time.perf_counter() - start
+
+    def body(self, openmetrics=False) -> bytes:
+
+        self.stats['scrapes'] += 1
+        return self.rendered[openmetrics]
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    # keep-alive, seperti scraper Prometheus
+    protocol_version = 'HTTP/1.1'
+    # header dan body dikirim terpisah, tanpa TCP_NODELAY tiap scrape tertahan delayed ACK (~40 ms)
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+
+        if self.path.split('?')[0] != '/metrics':
+            self.send_response(404)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+        openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+        body = self.server.registry.body(openmetrics)
+        self.send_response(200)
+        self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class MetricsExporter:
+    def __init__(self, host='127.0.0.1', port=9877, registry=None, max_processes=20, max_cores=1024):
+
+        self.registry = registry or MetricsRegistry()
+        self.server = ThreadingHTTPServer((host, port), _MetricsHandler)
+        self.server.registry = self.registry
+        self.thread = None
+        self.daemon = None
+        self.retention_rows = {'rolled_up': 0, 'deleted': 0}
+        self._register(max_processes, max_cores)
+
+    def _register(self, max_processes, max_cores):
+
+        family = self.registry.family
+        family('monitor_cpu_usage_percent', 'gauge', 'CPU usage of all cores in percent')
+        family('monitor_cpu_core_usage_percent', 'gauge', 'CPU usage per core in percent', ['core'], max_cores)
+        family('monitor_memory_bytes', 'gauge', 'Memory in bytes by type', ['type'])
+        family('monitor_memory_usage_percent', 'gauge', 'Memory usage in percent')
+        family('monitor_disk_bytes', 'gauge', 'Disk space in bytes by type', ['type'])
+        family('monitor_disk_usage_percent', 'gauge', 'Disk usage in percent')
+        family('monitor_network_rate_bytes_per_second', 'gauge', 'Network throughput by direction', ['direction'])
+        family('monitor_network_bytes', 'counter', 'Network bytes by direction', ['direction'])
+        family('monitor_sample_latency_seconds', 'gauge', 'Time spent taking one system sample')
+        family('monitor_connections', 'gauge', 'Tracked connections by state', ['state'], 16)
+        family('monitor_connections_by_process', 'gauge', 'Tracked connections by process', ['process'], max_processes)
+        family('monitor_suspicious_connections', 'gauge', 'Suspicious connections found in the last scan')
+        # gauge, bukan counter: total ringkasan bisa turun saat dibangun ulang setelah retensi
+        family('monitor_suspicious_connections_recorded', 'gauge', 'Suspicious connections recorded in the database')
+        family('monitor_connections_recorded', 'gauge', 'Connections recorded in the database')
+        family('monitor_wifi_devices', 'gauge', 'Active devices seen by a Wi-Fi scanner', ['collector'], 8)
+        family('monitor_wifi_known_devices', 'gauge', 'Devices known to the Wi-Fi inventory', ['collector'], 8)
+        family('monitor_wifi_scan_duration_seconds', 'gauge', 'Duration of the last Wi-Fi scan', ['collector'], 8)
+        family('monitor_wifi_signal_quality_percent', 'gauge', 'Wi-Fi link quality in percent', ['collector'], 8)
+        family('monitor_retention_rows', 'counter', 'Rows handled by the retention job', ['kind'])
+        family('monitor_collector_runs', 'counter', 'Successful collector runs', ['collector'], 32)
+        family('monitor_collector_failures', 'counter', 'Failed collector runs', ['collector'], 32)
+        family('monitor_collector_overruns', 'counter', 'Collector ticks that found the previous run still busy', ['collector'], 32)
+        family('monitor_collector_restarts', 'counter', 'Collector restarts after repeated failures', ['collector'], 32)
+        family('monitor_collector_duration_seconds', 'gauge', 'Duration of the last successful run', ['collector'], 32)
+        family('monitor_collector_last_success_timestamp_seconds', 'gauge', 'Time of the last successful run', ['collector'], 32)
+
+    def observe_system(self, store):
+
+        # nilai diambil dari MetricStore local monitor, sama dengan yang dilihat dashboard
+        latest = store.latest
+        registry = self.registry
+        registry.set_value('monitor_cpu_usage_percent', latest('cpu.total'))
+        registry.set('monitor_cpu_core_usage_percent',
+                     {(str(index),): latest(f'cpu.core.{index}') for index in range(store.core_count())})
+        registry.set('monitor_memory_bytes', {
+            (kind,): latest(f'memory.{kind}') for kind in ('total', 'available', 'used')
+        })
+        registry.set_value('monitor_memory_usage_percent', latest('memory.percent'))
+        registry.set('monitor_disk_bytes', {(kind,): latest(f'disk.{kind}') for kind in ('total', 'used', 'free')})
+        registry.set_value('monitor_disk_usage_percent', latest('disk.percent'))
+        registry.set('monitor_network_rate_bytes_per_second', {
+            ('receive',): latest('net.rx_rate'), ('transmit',): latest('net.tx_rate')
+        })
+        registry.set('monitor_network_bytes', {
+            ('receive',): latest('net.bytes_recv'), ('transmit',): latest('net.bytes_sent')
+        })
+        registry.set_value('monitor_sample_latency_seconds', latest('sample.latency'))
+
+    def observe_connections(self, result):
+
+        registry = self.registry
+        registry.set('monitor_connections', {(state,): count for state, count in result['by_state'].items()})
+        registry.set('monitor_connections_by_process',
+                     {(process or 'Unknown',): count for process, count in result['by_process'].items()})
+        registry.set_value('monitor_suspicious_connections', result['suspicious'])
+        summary = result['summary']
+        registry.set_value('monitor_connections_recorded', summary.get('total_connections', 0))
+        registry.set_value('monitor_suspicious_connections_recorded', summary.get('suspicious_connections', 0))
+
+    def observe_wifi(self, name, result):
+
+        for metric, value in (
+            ('monitor_wifi_devices', result['device_count']),
+            ('monitor_wifi_known_devices', result['inventory']['known']),
+            ('monitor_wifi_scan_duration_seconds', result['scan_seconds']),
+            ('monitor_wifi_signal_quality_percent', result.get('signal_strength')),
+        ):
+            # tiap scanner wifi hanya mengganti series miliknya sendiri
+            self.registry.set(metric, {(name,): value}, merge=True)
+
+    def observe_collectors(self, stats):
+
+        for metric, field in (
+            ('monitor_collector_runs', 'runs'),
+            ('monitor_collector_failures', 'failures'),
+            ('monitor_collector_overruns', 'overruns'),
+            ('monitor_collector_restarts', 'restarts'),
+            ('monitor_collector_duration_seconds', 'last_duration'),
+            ('monitor_collector_last_success_timestamp_seconds', 'last_success'),
+        ):
+            self.registry.set(metric, {(name,): collector[field] for name, collector in stats.items()})
+
+    def observe(self, name, result):
+
+        # listener daemon: dipanggil setiap run sukses, memakai hasil yang sudah ada di memori
+        if name == 'system':
+            self.observe_system(result)
+        elif name == 'connections':
+            self.observe_connections(result)
+        elif name == 'retention':
+            self.retention_rows['rolled_up'] += result['rolled_up_rows']
+            self.retention_rows['deleted'] += result['deleted_rows']
+            self.registry.set('monitor_retention_rows', {(kind,): rows for kind, rows in self.retention_rows.items()})
+        elif isinstance(result, dict) and 'device_count' in result:
+            self.observe_wifi(name, result)
+        if self.daemon is not None:
+            self.observe_collectors(self.daemon.get_stats())
+        self.registry.render()
+
+    def attach(self, daemon):
+
+        self.daemon = daemon
+        daemon.add_listener(self.observe)
+        return self
+
+    @property
+    def url(self):
+
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/metrics"
+
+    def start(self):
+
+        self.thread = threading.Thread(target=self.server.serve_forever, name='MetricsExporter', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+
+        self.server.shutdown()
+        self.server.server_close()
+
+def _synthetic_sample(cores):
+
+    Memory = namedtuple('Memory', ['total', 'available', 'used', 'percent'])
+    Disk = namedtuple('Disk', ['total', 'used', 'free', 'percent'])
+    NetIO = namedtuple('NetIO', ['bytes_recv', 'bytes_sent'])
+    return {
+        'timestamp': time.time(),
+        'cpu_total': 42.5,
+        'cpu_per_core': [float(core % 100) for core in range(cores)],
+        'memory': Memory(64 * 1024 ** 3, 32 * 1024 ** 3, 32 * 1024 ** 3, 50.0),
+        'disk': Disk(1024 ** 4, 512 * 1024 ** 3, 512 * 1024 ** 3, 50.0),
+        'net_io': NetIO(10 ** 9, 10 ** 8),
+        'net_rx_rate': 125000.0,
+        'net_tx_rate': 62500.0,
+        'latency': 0.0004,
+    }
+
+def benchmark_exporter(rate=100, seconds=10, cores=128, processes=500):
+
+    # data sintetis yang besar: banyak core dan proses (dipotong oleh batas kardinalitas)
+    # import di sini: monitor_daemon sendiri meng-import modul ini
+    from monitor_daemon import load_script
+
+    store = load_script('local_monitor').MetricStore()
+    store.record_sample(_synthetic_sample(cores))
+    exporter = MetricsExporter(port=0).start()
+    exporter.observe('system', store)
+    exporter.observe('connections', {
+        'suspicious': 3,
+        'by_state': {'ESTABLISHED': 900, 'LISTEN': 40, 'TIME_WAIT': 60},
+        'by_process': {f'proc-{index}': index % 17 + 1 for index in range(processes)},
+        'summary': {'total_connections': 123456, 'suspicious_connections': 42},
+    })
+    exporter.observe('wifi', {'device_count': 12, 'scan_seconds': 1.4, 'inventory': {'known': 30}})
+    renders = exporter.registry.stats['renders']
+
+    host, port = exporter.server.server_address[:2]
+    client = http.client.HTTPConnection(host, port)
+    latencies = []
+    total = int(rate * seconds)
+    cpu_start = time.process_time()
+    start = time.perf_counter()
+    for index in range(total):
+        # scrape dengan laju tetap, seperti beberapa Prometheus yang men-scrape bersamaan
+        delay = start + index / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        sent = time.perf_counter()
+        client.request('GET', '/metrics')
+        response = client.getresponse()
+        body = response.read()
+        latencies.append(time.perf_counter() - sent)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu_start
+    client.close()
+    exporter.stop()
+
+    latencies.sort()
+    print(f"📈 {total} scrape dalam {elapsed:.2f} detik ({total / elapsed:.0f}/detik), "
+          f"{len(body)} byte, {exporter.registry.families['monitor_connections_by_process'].max_series} "
+          f"series proses dari {processes}")
+    print(f"   Latensi : p50 {statistics.median(latencies) * 1000:.3f} ms | "
+          f"p99 {latencies[int(len(latencies) * 0.99) - 1] * 1000:.3f} ms | maks {latencies[-1] * 1000:.3f} ms")
+    print(f"   CPU     : {cpu / total * 1000:.3f} ms/scrape (server + client), "
+          f"render ulang saat scrape: {exporter.registry.stats['renders'] - renders}")
+
+    if psutil is not None:
+        # pembanding: biaya kalau setiap scrape memanggil psutil langsung
+        probe_start = time.perf_counter()
+        for _ in range(20):
+            psutil.cpu_percent(percpu=True)
+            psutil.virtual_memory()
+            psutil.disk_usage('/')
+            psutil.net_io_counters()
+            psutil.net_connections()
+        print(f"   Pembanding psutil per scrape: {(time.perf_counter() - probe_start) / 20 * 1000:.3f} ms")
+
+    return latencies
+
+if __name__ == "__main__":
+    if '--bench-scrape' in sys.argv:
+        benchmark_exporter()
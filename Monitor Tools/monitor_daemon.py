@@ -0,0 +1,548 @@
+import os
+import sys
+import signal
+import random
+import asyncio
+import logging
+import platform
+import functools
+import threading
+import importlib.util
+import multiprocessing
+import concurrent.futures
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from metrics_exporter import MetricsExporter
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+WIFI_DIR = os.path.join(BASE_DIR, 'Wifi Monitor')
+
+# nama file script pakai spasi, jadi dimuat lewat importlib dari path
+SCRIPTS = {
+    'connection_monitor': os.path.join('Network Monitor', 'Active Network Connection Monitoring.py'),
+    'local_monitor': os.path.join('Local Monitor', 'local monitor cli.py'),
+    'wifi_futures': os.path.join('Wifi Monitor', 'Concurrent-Futures Wifi Monitor.py'),
+    'wifi_threadpool': os.path.join('Wifi Monitor', 'ThreadPoolExecutor Wifi Monitor.py'),
+    'wifi_scapy': os.path.join('Wifi Monitor', 'Root Scapy WIfi Monitor.py'),
+}
+
+# collector wifi: (script, nama class)
+WIFI_SCANNERS = {
+    'wifi': ('wifi_futures', 'RexzeaWifiMonitoring'),
+    'wifi-neigh': ('wifi_threadpool', 'WiFiMonitor'),
+    'wifi-scapy': ('wifi_scapy', 'WiFiMonitor'),
+}
+
+OVERRUN_POLICIES = ('skip', 'queue')
+OFFLOAD_MODES = ('inline', 'thread', 'process')
+
+_load_lock = threading.Lock()
+
+def load_script(name):
+
+    # setup collector jalan paralel di thread, jangan sampai satu script dimuat dua kali
+    with _load_lock:
+        if name in sys.modules:
+            return sys.modules[name]
+        # modul bersama wifi (icmp_sweep, network_state, ...) di-import biasa oleh script wifi
+        if WIFI_DIR not in sys.path:
+            sys.path.insert(0, WIFI_DIR)
+        spec = importlib.util.spec_from_file_location(name, os.path.join(BASE_DIR, SCRIPTS[name]))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        try:
+            spec.loader.exec_module(module)
+        except BaseException:
+            del sys.modules[name]
+            raise
+        return module
+
+class Collector:
+    def __init__(self, name, run: Callable, setup: Optional[Callable] = None,
+                 teardown: Optional[Callable] = None, interval=60, jitter=0.1, timeout=None,
+                 overrun='skip', offload='thread', max_failures=3, restart_backoff=5,
+                 restart_backoff_max=300):
+
+        if overrun not in OVERRUN_POLICIES:
+            raise ValueError(f"Policy overrun tidak dikenal: {overrun}")
+        if offload not in OFFLOAD_MODES:
+            raise ValueError(f"Mode offload tidak dikenal: {offload}")
+
+        self.name = name
+        # setup() -> konteks, run(konteks) -> hasil, teardown(konteks) untuk flush/close
+        self.run = run
+        self.setup = setup
+        self.teardown = teardown
+        self.interval = interval
+        # jitter = fraksi interval, supaya collector tidak selalu jalan di detik yang sama
+        self.jitter = jitter
+        self.timeout = timeout
+        self.overrun = overrun
+        # mode process: run dan konteksnya harus bisa di-pickle
+        self.offload = offload
+        # setelah max_failures gagal berturut-turut collector di-restart (teardown + setup)
+        self.max_failures = max_failures
+        self.restart_backoff = restart_backoff
+        self.restart_backoff_max = restart_backoff_max
+
+        self.context = None
+        self.ready = False
+        self.task: Optional[asyncio.Task] = None
+        # future executor yang masih jalan, tetap terhitung sibuk walau sudah timeout
+        self.inflight: Optional[concurrent.futures.Future] = None
+        self.queued = False
+        self.retry_at = 0.0
+        self.consecutive_failures = 0
+        self.restart_streak = 0
+        self.last_result = None
+        self.stats = {
+            'runs': 0, 'failures': 0, 'timeouts': 0, 'overruns': 0, 'skipped': 0,
+            'queued': 0, 'restarts': 0, 'last_duration': None, 'last_success': None,
+            'last_error': None
+        }
+
+    def busy_executor(self) -> bool:
+
+        return self.inflight is not None and not self.inflight.done()
+
+    def busy(self) -> bool:
+
+        if self.task is not None and not self.task.done():
+            return True
+        return self.busy_executor()
+
+    def next_delay(self, tick):
+
+        # offset jitter acak per tick, tidak terakumulasi ke jadwal
+        return tick + random.uniform(-self.jitter, self.jitter) * self.interval
+
+class MonitorDaemon:
+    def __init__(self, collectors=(), thread_workers=8, process_workers=2, drain_timeout=30,
+                 logger=None):
+
+        self.collectors: Dict[str, Collector] = {}
+        for collector in collectors:
+            self.add(collector)
+        self.threads = concurrent.futures.ThreadPoolExecutor(thread_workers, thread_name_prefix='collector')
+        self.process_workers = process_workers
+        self.processes = None
+        # batas waktu menunggu run yang masih jalan saat shutdown
+        self.drain_timeout = drain_timeout
+        self.logger = logger or logging.getLogger('MonitorDaemon')
+        self.listeners: List[Callable] = []
+        self.stopping: Optional[asyncio.Event] = None
+
+    def add(self, collector: Collector):
+
+        if collector.name in self.collectors:
+            raise ValueError(f"Collector {collector.name} sudah terdaftar")
+        self.collectors[collector.name] = collector
+        return collector
+
+    def add_listener(self, callback: Callable):
+
+        # callback(nama collector, hasil) dipanggil di thread event loop setiap run sukses
+        self.listeners.append(callback)
+
+    def _executor(self, offload):
+
+        if offload == 'process':
+            # pool proses dibuat hanya kalau ada collector yang membutuhkannya,
+            # pakai spawn: fork dari proses yang punya banyak thread bisa mewarisi lock yang terkunci
+            if self.processes is None:
+                self.processes = concurrent.futures.ProcessPoolExecutor(
+                    self.process_workers, mp_context=multiprocessing.get_context('spawn')
+                )
+            return self.processes
+        return self.threads
+
+    async def _call(self, collector, func, *args, offload=None, timeout=None):
+
+        offload = offload or collector.offload
+        if asyncio.iscoroutinefunction(func):
+            return await asyncio.wait_for(func(*args), timeout)
+        if offload == 'inline':
+            return func(*args)
+
+        try:
+            future = self._executor(offload).submit(func, *args)
+            collector.inflight = future
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except concurrent.futures.BrokenExecutor:
+            # worker proses mati (crash/OOM): pool dibuat ulang di run berikutnya
+            if offload == 'process' and self.processes is not None:
+                self.processes.shutdown(wait=False, cancel_futures=True)
+                self.processes = None
+            raise
+
+    async def _teardown(self, collector):
+
+        if collector.ready and collector.teardown is not None:
+            try:
+                await self._call(collector, collector.teardown, collector.context, offload='thread',
+                                 timeout=self.drain_timeout)
+            except Exception as e:
+                self.logger.error(f"Teardown {collector.name} gagal: {e}")
+        collector.context = None
+        collector.ready = False
+
+    async def _wait_inflight(self, collector) -> bool:
+
+        # run yang timeout masih jalan di executor dan memakai konteks, tunggu dulu sebelum teardown
+        if collector.busy_executor():
+            await asyncio.wait([asyncio.wrap_future(collector.inflight)], timeout=self.drain_timeout)
+        return not collector.busy_executor()
+
+    async def _restart(self, collector, now):
+
+        # isolasi crash: collector yang rusak di-reset tanpa menyentuh collector lain
+        await self._wait_inflight(collector)
+        await self._teardown(collector)
+        collector.stats['restarts'] += 1
+        collector.restart_streak += 1
+        # jeda makin panjang kalau restart terus gagal, reset setelah run sukses
+        backoff = min(collector.restart_backoff * 2 ** (collector.restart_streak - 1), collector.restart_backoff_max)
+        collector.retry_at = now + backoff
+        collector.consecutive_failures = 0
+        self.logger.warning(f"Collector {collector.name} di-restart, coba lagi dalam {backoff:.0f} detik")
+
+    async def _execute(self, collector):
+
+        loop = asyncio.get_running_loop()
+        if loop.time() < collector.retry_at:
+            return
+        start = time.perf_counter()
+        try:
+            if not collector.ready:
+                if collector.setup is not None:
+                    # setup selalu di thread: objeknya harus tinggal di proses daemon
+                    collector.context = await self._call(collector, collector.setup, offload='thread',
+                                                         timeout=collector.timeout)
+                collector.ready = True
+            args = (collector.context,) if collector.setup is not None else ()
+            result = await self._call(collector, collector.run, *args, timeout=collector.timeout)
+
+        except asyncio.TimeoutError:
+            collector.stats['timeouts'] += 1
+            self._record_failure(collector, f"timeout setelah {collector.timeout} detik")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._record_failure(collector, f"{type(e).__name__}: {e}")
+        else:
+            duration = time.perf_counter() - start
+            collector.stats['runs'] += 1
+            collector.stats['last_duration'] = duration
+            collector.stats['last_success'] = time.time()
+            collector.consecutive_failures = 0
+            collector.restart_streak = 0
+            collector.last_result = result
+            self.logger.debug(f"{collector.name} selesai dalam {duration:.3f} detik")
+            for callback in self.listeners:
+                try:
+                    callback(collector.name, result)
+                except Exception as e:
+                    self.logger.error(f"Listener gagal untuk {collector.name}: {e}")
+            return
+
+        if collector.consecutive_failures >= collector.max_failures or not collector.ready:
+            await self._restart(collector, loop.time())
+
+    def _record_failure(self, collector, message):
+
+        collector.stats['failures'] += 1
+        collector.stats['last_error'] = message
+        collector.consecutive_failures += 1
+        self.logger.error(f"Collector {collector.name} gagal: {message}")
+
+    async def _run_task(self, collector):
+
+        # policy queue: run yang tertunda dijalankan langsung setelah run sebelumnya selesai
+        while True:
+            await self._execute(collector)
+            if not collector.queued or self.stopping.is_set() or collector.busy_executor():
+                return
+            collector.queued = False
+
+    def _start_run(self, collector):
+
+        collector.queued = False
+        collector.task = asyncio.create_task(self._run_task(collector), name=f'collector-{collector.name}')
+
+    async def _schedule(self, collector):
+
+        loop = asyncio.get_running_loop()
+        next_tick = loop.time()
+        while not self.stopping.is_set():
+            if collector.busy():
+                # overrun: run sebelumnya belum selesai saat jadwal berikutnya tiba
+                collector.stats['overruns'] += 1
+                if collector.overrun == 'queue' and not collector.queued:
+                    collector.queued = True
+                    collector.stats['queued'] += 1
+                else:
+                    collector.stats['skipped'] += 1
+                self.logger.warning(f"Collector {collector.name} overrun ({collector.overrun})")
+            elif collector.queued or loop.time() >= collector.retry_at:
+                self._start_run(collector)
+
+            next_tick += collector.interval
+            now = loop.time()
+            if next_tick < now:
+                # jadwal yang sudah lewat dilewati, tidak menumpuk
+                missed = int((now - next_tick) // collector.interval) + 1
+                next_tick += missed * collector.interval
+            delay = max(0.0, collector.next_delay(next_tick) - now)
+            try:
+                await asyncio.wait_for(self.stopping.wait(), delay)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _supervise(self, collector):
+
+        # kalau scheduler sendiri crash, jalankan ulang dengan jeda
+        while not self.stopping.is_set():
+            try:
+                await self._schedule(collector)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Scheduler {collector.name} crash: {e}")
+                await asyncio.sleep(collector.restart_backoff)
+
+    def stop(self):
+
+        if self.stopping is not None:
+            self.stopping.set()
+
+    async def _drain_collector(self, collector):
+
+        if not await self._wait_inflight(collector):
+            # masih dipakai thread yang macet: menutup writer di tengah jalan lebih berbahaya
+            self.logger.error(f"Collector {collector.name} masih berjalan setelah {self.drain_timeout} detik, "
+                              f"teardown dilewati")
+            return
+        await self._teardown(collector)
+
+    async def _drain(self):
+
+        # tunggu run yang masih jalan, lalu teardown (flush writer, kirim sisa alert)
+        running = [collector.task for collector in self.collectors.values()
+                   if collector.task is not None and not collector.task.done()]
+        if running:
+            self.logger.info(f"Menunggu {len(running)} collector selesai...")
+            done, pending = await asyncio.wait(running, timeout=self.drain_timeout)
+            for task in pending:
+                task.cancel()
+
+        await asyncio.gather(*(self._drain_collector(collector) for collector in self.collectors.values()))
+
+        self.threads.shutdown(wait=False, cancel_futures=True)
+        if self.processes is not None:
+            self.processes.shutdown(wait=True, cancel_futures=True)
+
+    async def run(self, duration=None):
+
+        self.stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError, ValueError):
+                # windows / bukan main thread: andalkan KeyboardInterrupt
+                pass
+
+        schedulers = [asyncio.create_task(self._supervise(collector)) for collector in self.collectors.values()]
+        try:
+            if duration is not None:
+                try:
+                    await asyncio.wait_for(self.stopping.wait(), duration)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await self.stopping.wait()
+        finally:
+            self.stopping.set()
+            for task in schedulers:
+                task.cancel()
+            await asyncio.gather(*schedulers, return_exceptions=True)
+            await self._drain()
+
+    def get_stats(self):
+
+        return {name: dict(collector.stats, busy=collector.busy()) for name, collector in self.collectors.items()}
+
+def run_retention(db_path):
+
+    # fungsi top-level supaya bisa dikirim ke pool proses (rollup + VACUUM berat di CPU/IO)
+    module = load_script('connection_monitor')
+    manager = module.RetentionManager(db_path, logging.getLogger('RetentionManager'))
+    try:
+        manager.run_once()
+    finally:
+        manager.stop()
+    return {
+        'rolled_up_rows': manager.rolled_up_rows,
+        'deleted_rows': manager.deleted_rows,
+        'duration': manager.last_run_duration
+    }
+
+def connection_collector(interval=30, proc_backend=False):
+
+    def setup():
+
+        module = load_script('connection_monitor')
+        backend = module.ProcNetConnections() if proc_backend else None
+        # retensi tidak pakai thread sendiri, dijadwalkan daemon sebagai collector 'retention'
+        return module.NetworkConnectionMonitor(connection_backend=backend, retention=False)
+
+    def run(monitor):
+
+        suspicious = monitor.analyze_connections()
+        # hitungan per status/proses diambil dari snapshot yang sudah ada, tanpa panggilan psutil lagi
+        states = list(monitor.snapshot.values())
+        return {
+            'suspicious': len(suspicious),
+            'tracked': len(states),
+            'by_state': Counter(state.status for state in states),
+            'by_process': Counter(state.process_name for state in states),
+            'summary': monitor.get_connection_summary()
+        }
+
+    def teardown(monitor):
+
+        monitor.close()
+        if hasattr(monitor.connection_backend, 'close'):
+            monitor.connection_backend.close()
+
+    return Collector('connections', run, setup, teardown, interval=interval, timeout=interval)
+
+def retention_collector(db_path='network_connections.db', interval=300):
+
+    return Collector('retention', functools.partial(run_retention, db_path), interval=interval,
+                     timeout=interval, offload='process')
+
+def system_collector(interval=5, proc_backend=False):
+
+    def setup():
+
+        module = load_script('local_monitor')
+        backend = module.LinuxProcCollector() if proc_backend else None
+        sampler = module.SystemSampler(backend=backend)
+        store = module.MetricStore()
+        store.host = sampler.host
+        return sampler, store
+
+    def run(context):
+
+        # store jadi satu-satunya sumber data, exporter membaca nilai terbaru dari sini
+        sampler, store = context
+        store.record_sample(sampler.sample())
+        return store
+
+    def teardown(context):
+
+        sampler, _ = context
+        if hasattr(sampler.backend, 'close'):
+            sampler.backend.close()
+
+    return Collector('system', run, setup, teardown, interval=interval, timeout=interval)
+
+def wifi_collector(name='wifi', interval=60, cold_interval=900):
+
+    script, class_name = WIFI_SCANNERS[name]
+
+    def setup():
+
+        monitor = getattr(load_script(script), class_name)()
+        monitor.open_inventory(interval, cold_interval)
+        return monitor
+
+    def run(monitor):
+
+        return monitor.monitor_cycle(verbose=False)
+
+    def teardown(monitor):
+
+        monitor.close()
+
+    # sweep yang overrun diantrikan sekali: host yang jatuh tempo tetap terkejar
+    return Collector(name, run, setup, teardown, interval=interval, timeout=interval * 2,
+                     overrun='queue', restart_backoff=30)
+
+def build_collectors(names, proc_backend=False):
+
+    collectors = []
+    for name in names:
+        if name == 'connections':
+            collectors.append(connection_collector(proc_backend=proc_backend))
+        elif name == 'retention':
+            collectors.append(retention_collector())
+        elif name == 'system':
+            collectors.append(system_collector(proc_backend=proc_backend))
+        elif name in WIFI_SCANNERS:
+            collectors.append(wifi_collector(name))
+        else:
+            raise ValueError(f"Collector tidak dikenal: {name}")
+    return collectors
+
+def status_collector(daemon, interval=60):
+
+    def run():
+
+        stats_by_name = {name: stats for name, stats in daemon.get_stats().items() if name != 'status'}
+        if not any(stats['runs'] or stats['failures'] for stats in stats_by_name.values()):
+            return
+        for name, stats in stats_by_name.items():
+            if stats['last_duration'] is None:
+                print(f"📋 {name:<12} | belum ada run sukses ({stats['last_error'] or '-'})")
+                continue
+            print(f"📋 {name:<12} | {stats['runs']} run, {stats['failures']} gagal, "
+                  f"{stats['overruns']} overrun, {stats['restarts']} restart | "
+                  f"terakhir {stats['last_duration'] * 1000:.0f} ms")
+
+    return Collector('status', run, interval=interval, jitter=0, offload='inline')
+
+def main(names=('connections', 'retention', 'system', 'wifi'), duration=None, proc_backend=False,
+         metrics_port=None, metrics_host='127.0.0.1'):
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s: %(message)s',
+        handlers=[
+            logging.FileHandler('monitor_daemon.log'),
+            logging.StreamHandler()
+        ]
+    )
+    print("🛰️ Monitor Daemon 🛰️")
+    print(f"Collector: {', '.join(names)}")
+
+    daemon = MonitorDaemon(build_collectors(names, proc_backend))
+    daemon.add(status_collector(daemon))
+
+    # endpoint /metrics untuk Prometheus, isinya dirender dari hasil collector
+    # default hanya localhost: isinya memuat nama proses dan inventaris perangkat
+    exporter = None
+    if metrics_port is not None:
+        exporter = MetricsExporter(metrics_host, metrics_port).attach(daemon).start()
+        print(f"📡 Metrics di {exporter.url}")
+    try:
+        asyncio.run(daemon.run(duration))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if exporter is not None:
+            exporter.stop()
+    print("✋ Daemon dihentikan, semua data sudah di-flush.")
+
+if __name__ == "__main__":
+    names = ('connections', 'retention', 'system', 'wifi')
+    if '--collectors' in sys.argv:
+        names = tuple(sys.argv[sys.argv.index('--collectors') + 1].split(','))
+    duration = float(sys.argv[sys.argv.index('--duration') + 1]) if '--duration' in sys.argv else None
+    metrics_port = int(sys.argv[sys.argv.index('--metrics-port') + 1]) if '--metrics-port' in sys.argv else None
+    metrics_host = sys.argv[sys.argv.index('--metrics-host') + 1] if '--metrics-host' in sys.argv else '127.0.0.1'
+    main(names, duration, proc_backend='--proc-backend' in sys.argv and platform.system() == 'Linux',
+         metrics_port=metrics_port, metrics_host=metrics_host)
@@ -0,0 +1,32 @@
+import os
+
+class ProcFile:
+    def __init__(self, path, size=8192):
+
+        # fd dibuka sekali, dibaca ulang dengan pread ke buffer yang sama
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.buffer = bytearray(size)
+
+    def read(self):
+
+        # seq_file di /proc hanya memberi sekitar satu halaman per read,
+        # jadi pread terus di offset berikutnya sampai dapat 0 (EOF)
+        offset = 0
+        while True:
+            if offset == len(self.buffer):
+                # buffer penuh, perbesar tanpa membuang yang sudah terbaca
+                buffer = bytearray(len(self.buffer) * 2)
+                buffer[:offset] = self.buffer
+                self.buffer = buffer
+            with memoryview(self.buffer) as view:
+                length = os.preadv(self.fd, [view[offset:]], offset)
+            if not length:
+                return memoryview(self.buffer)[:offset]
+            offset += length
+
+    def close(self):
+
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import pytest
+
+# script di Monitor Tools namanya pakai spasi, dimuat lewat load_script milik daemon
+MONITOR_TOOLS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Monitor Tools')
+sys.path.insert(0, MONITOR_TOOLS)
+sys.path.insert(0, os.path.join(MONITOR_TOOLS, 'Wifi Monitor'))
+
+from monitor_daemon import load_script
+
+@pytest.fixture
+def connection_monitor():
+
+    return load_script('connection_monitor')
+
+@pytest.fixture
+def local_monitor():
+
+    return load_script('local_monitor')
+
+@pytest.fixture
+def wifi_scapy():
+
+    return load_script('wifi_scapy')
@@ -0,0 +1,123 @@
+import json
+import logging
+import time
+
+logger = logging.getLogger('test')
+
+class MemorySink:
+    def __init__(self, delay=0.0):
+
+        self.batches = []
+        self.delay = delay
+        self.closed = False
+
+    def write(self, alerts):
+
+        time.sleep(self.delay)
+        self.batches.append(list(alerts))
+
+    def close(self):
+
+        self.closed = True
+
+    @property
+    def alerts(self):
+
+        return [alert for batch in self.batches for alert in batch]
+
+class BrokenSink:
+    def write(self, alerts):
+
+        raise OSError('sink mati')
+
+    def close(self):
+        pass
+
+def alert_details(remote='203.0.113.5:4444', status='ESTABLISHED', rules=('suspicious_port',)):
+
+    return {
+        'process': 'nc',
+        'local': '192.0.2.2:50000',
+        'remote': remote,
+        'status': status,
+        'rules': list(rules),
+    }
+
+def test_identical_alerts_are_deduplicated(connection_monitor):
+
+    sink = MemorySink()
+    dispatcher = connection_monitor.AlertDispatcher([sink], logger, flush_interval=0.05)
+    for _ in range(5):
+        dispatcher.submit('suspicious_connection', alert_details())
+    dispatcher.close()
+
+    assert len(sink.alerts) == 1
+    assert dispatcher.get_stats()['suppressed'] == 4
+    assert sink.closed
+
+def test_rate_limit_per_process_and_remote(connection_monitor):
+
+    sink = MemorySink()
+    dispatcher = connection_monitor.AlertDispatcher([sink], logger, max_per_key=2, flush_interval=0.05)
+    # status beda = fingerprint beda, tapi key (proses, remote) sama
+    for status in ('SYN_SENT', 'ESTABLISHED', 'CLOSE_WAIT', 'TIME_WAIT'):
+        dispatcher.submit('suspicious_connection', alert_details(status=status))
+    dispatcher.submit('suspicious_connection', alert_details(remote='198.51.100.7:22'))
+    dispatcher.close()
+
+    remotes = [alert['details']['remote'] for alert in sink.alerts]
+    assert remotes.count('203.0.113.5:4444') == 2
+    assert remotes.count('198.51.100.7:22') == 1
+    assert dispatcher.get_stats()['suppressed'] == 2
+
+def test_alerts_are_written_in_batches(connection_monitor):
+
+    sink = MemorySink()
+    dispatcher = connection_monitor.AlertDispatcher([sink], logger, batch_size=10, flush_interval=5)
+    for index in range(25):
+        dispatcher.submit('suspicious_connection', alert_details(remote=f'203.0.113.{index}:4444'))
+    dispatcher.close()
+
+    assert [len(batch) for batch in sink.batches] == [10, 10, 5]
+
+def test_failing_sink_does_not_block_other_sinks(connection_monitor):
+
+    sink = MemorySink()
+    dispatcher = connection_monitor.AlertDispatcher([BrokenSink(), sink], logger, flush_interval=0.05)
+    dispatcher.submit('suspicious_connection', alert_details())
+    dispatcher.close()
+
+    assert len(sink.alerts) == 1
+    assert dispatcher.get_stats()['sink_errors'] == 1
+
+def test_jsonl_and_webhook_sinks(connection_monitor, tmp_path):
+
+    server = connection_monitor.LocalWebhookServer().start()
+    path = tmp_path / 'alerts.jsonl'
+    try:
+        dispatcher = connection_monitor.AlertDispatcher(
+            [connection_monitor.JsonlAlertSink(str(path)), connection_monitor.WebhookAlertSink(server.url)],
+            logger, flush_interval=0.05
+        )
+        dispatcher.submit('suspicious_connection', alert_details())
+        dispatcher.close()
+    finally:
+        server.stop()
+
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [alert['details']['remote'] for alert in lines] == ['203.0.113.5:4444']
+    assert [[alert['details']['remote'] for alert in batch] for batch in server.received] == [['203.0.113.5:4444']]
+
+def test_close_is_bounded_when_queue_is_full(connection_monitor):
+
+    sink = MemorySink(delay=0.5)
+    dispatcher = connection_monitor.AlertDispatcher(
+        [sink], logger, max_queue=2, batch_size=1, flush_interval=0.05
+    )
+    for index in range(10):
+        dispatcher.submit('suspicious_connection', alert_details(remote=f'203.0.113.{index}:4444'))
+
+    start = time.monotonic()
+    dispatcher.close(timeout=0.2)
+    assert time.monotonic() - start < 1
+    assert dispatcher.get_stats()['dropped'] > 0
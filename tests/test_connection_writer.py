@@ -0,0 +1,63 @@
+import logging
+import sqlite3
+
+import pytest
+
+logger = logging.getLogger('test')
+
+def connection_row(port, timestamp=1000):
+
+    return (timestamp, '192.0.2.2', port, '203.0.113.5', 443, 'ESTABLISHED', 'curl', 42, 0,
+            'opened', timestamp, timestamp)
+
+@pytest.fixture
+def writer(connection_monitor, tmp_path):
+
+    db_path = str(tmp_path / 'connections.db')
+    conn = connection_monitor.open_database(db_path)
+    connection_monitor.migrate_database(conn)
+    conn.close()
+    summary = connection_monitor.ConnectionSummary()
+    writer = connection_monitor.ConnectionWriter(db_path, logger, batch_size=1000, summary=summary,
+                                                 max_pending=3)
+    # jangan menunggu busy_timeout 5 detik saat database sengaja dikunci
+    writer.conn.execute('PRAGMA busy_timeout=0')
+    yield writer
+    writer.close()
+
+def count_rows(writer):
+
+    return writer.conn.execute('SELECT COUNT(*) FROM network_connections').fetchone()[0]
+
+def test_locked_database_keeps_batch_for_next_flush(writer):
+
+    writer.add(connection_row(50000))
+    writer.add(connection_row(50001))
+
+    blocker = sqlite3.connect(writer.db_path)
+    blocker.execute('BEGIN EXCLUSIVE')
+    assert writer.flush() == 0
+    blocker.rollback()
+    blocker.close()
+
+    assert writer.get_stats()['pending_rows'] == 2
+    assert writer.flush() == 2
+    assert count_rows(writer) == 2
+    assert writer.summary.total_connections == 2
+
+def test_pending_rows_are_capped_while_database_is_locked(writer):
+
+    blocker = sqlite3.connect(writer.db_path)
+    blocker.execute('BEGIN EXCLUSIVE')
+    for port in range(50000, 50005):
+        writer.add(connection_row(port))
+    assert writer.flush() == 0
+    blocker.rollback()
+    blocker.close()
+
+    stats = writer.get_stats()
+    assert (stats['pending_rows'], stats['dropped_rows']) == (3, 2)
+    assert writer.flush() == 3
+    # yang dibuang baris tertua
+    ports = [row[0] for row in writer.conn.execute('SELECT local_port FROM network_connections ORDER BY id')]
+    assert ports == [50002, 50003, 50004]
@@ -0,0 +1,37 @@
+import ipaddress
+
+import pytest
+
+from device_inventory import DeviceInventory
+
+HOME = [ipaddress.ip_network('192.0.2.0/24')]
+OFFICE = [ipaddress.ip_network('198.51.100.0/24')]
+
+@pytest.fixture
+def inventory(tmp_path):
+
+    inventory = DeviceInventory(str(tmp_path / 'inventory.db'), live_interval=60, cold_interval=900)
+    yield inventory
+    inventory.close()
+
+def test_liveness_prune_uses_ts_index(inventory):
+
+    plan = inventory.conn.execute('EXPLAIN QUERY PLAN DELETE FROM liveness WHERE ts < ?', (0,)).fetchall()
+    assert any('idx_liveness_ts' in row[-1] for row in plan)
+
+def test_devices_outside_swept_networks_become_unknown(inventory):
+
+    inventory.record([{'ip': '192.0.2.10'}, {'ip': '192.0.2.11'}], now=1000, networks=HOME)
+    assert {device['ip'] for device in inventory.active_devices()} == {'192.0.2.10', '192.0.2.11'}
+
+    # pindah jaringan: perangkat lama tidak bisa diprobe lagi
+    events = inventory.record([{'ip': '198.51.100.5'}], now=1060, networks=OFFICE)
+    assert sorted((event, device['ip']) for event, device in events) == [
+        ('join', '198.51.100.5'), ('leave', '192.0.2.10'), ('leave', '192.0.2.11')
+    ]
+    assert [device['ip'] for device in inventory.active_devices()] == ['198.51.100.5']
+    assert inventory.devices['192.0.2.10'].state == 'unknown'
+
+    # kembali ke jaringan rumah dan membalas lagi: join, tanpa leave ganda
+    events = inventory.record([{'ip': '192.0.2.10'}], now=1120, networks=HOME + OFFICE)
+    assert [(event, device['ip']) for event, device in events] == [('join', '192.0.2.10')]
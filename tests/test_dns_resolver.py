@@ -0,0 +1,142 @@
+import socket
+import struct
+import threading
+
+import pytest
+
+from dns_resolver import ReverseResolver
+
+class StubDnsServer:
+    # server PTR lokal: jawab dari tabel names, NXDOMAIN untuk sisanya, diam untuk silent
+    def __init__(self, names, silent=()):
+
+        self.names = names
+        self.silent = set(silent)
+        self.queries = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(('127.0.0.1', 0))
+        self.thread = threading.Thread(target=self._serve, daemon=True)
+        self.thread.start()
+
+    @property
+    def address(self):
+
+        return self.sock.getsockname()
+
+    def _serve(self):
+
+        while True:
+            try:
+                data, client = self.sock.recvfrom(512)
+            except OSError:
+                return
+            query_id = struct.unpack('!H', data[:2])[0]
+            offset, labels = 12, []
+            while data[offset]:
+                length = data[offset]
+                labels.append(data[offset + 1:offset + 1 + length].decode())
+                offset += 1 + length
+            question = data[12:offset + 5]
+            ip = '.'.join(reversed(labels[:4]))
+            self.queries.append(ip)
+            if ip in self.silent:
+                continue
+            if ip in self.names:
+                name = b''.join(bytes([len(label)]) + label.encode() for label in self.names[ip].split('.')) + b'\0'
+                answer = b'\xc0\x0c' + struct.pack('!HHIH', 12, 1, 60, len(name)) + name
+                self.sock.sendto(struct.pack('!HHHHHH', query_id, 0x8180, 1, 1, 0, 0) + question + answer, client)
+            else:
+                self.sock.sendto(struct.pack('!HHHHHH', query_id, 0x8183, 1, 0, 0, 0) + question, client)
+
+    def close(self):
+
+        self.sock.close()
+
+@pytest.fixture
+def stub_dns():
+
+    server = StubDnsServer({'192.0.2.10': 'printer.lan', '192.0.2.11': 'nas.lan'}, silent=['192.0.2.99'])
+    yield server
+    server.close()
+
+@pytest.fixture
+def resolver(stub_dns, tmp_path):
+
+    hosts = tmp_path / 'hosts'
+    hosts.write_text('')
+    resolver = ReverseResolver(nameserver=stub_dns.address, timeout=0.3, hosts_path=str(hosts))
+    yield resolver
+    resolver.close()
+
+def test_resolves_ptr_from_stub_server(resolver):
+
+    assert resolver.submit('192.0.2.10').result(timeout=2) == 'printer.lan'
+
+def test_positive_and_negative_results_are_cached(resolver, stub_dns):
+
+    for _ in range(3):
+        assert resolver.submit('192.0.2.11').result(timeout=2) == 'nas.lan'
+        assert resolver.submit('192.0.2.12').result(timeout=2) is None
+
+    assert stub_dns.queries.count('192.0.2.11') == 1
+    assert stub_dns.queries.count('192.0.2.12') == 1
+    stats = resolver.get_stats()
+    assert stats['hits'] == 2
+    assert stats['negative_hits'] == 2
+
+def test_silent_server_times_out(resolver):
+
+    assert resolver.submit('192.0.2.99').result(timeout=2) is None
+    assert resolver.get_stats()['timeouts'] == 1
+
+def test_enrich_yields_every_device(resolver):
+
+    devices = [{'ip': ip} for ip in ('192.0.2.99', '192.0.2.10', '192.0.2.12')]
+    enriched = {device['ip']: device['hostname'] for device in resolver.enrich(devices, default='Unknown')}
+
+    assert enriched == {'192.0.2.99': 'Unknown', '192.0.2.10': 'printer.lan', '192.0.2.12': 'Unknown'}
+
+@pytest.fixture
+def hanging_getnameinfo(monkeypatch):
+
+    # resolver sistem yang macet sampai dilepas di akhir test
+    release = threading.Event()
+    calls = []
+
+    def getnameinfo(address, flags):
+
+        calls.append(address[0])
+        release.wait(5)
+        raise socket.gaierror('macet')
+
+    monkeypatch.setattr(socket, 'getnameinfo', getnameinfo)
+    yield calls
+    release.set()
+
+def test_system_fallback_uses_bounded_threads(hanging_getnameinfo, tmp_path):
+
+    hosts = tmp_path / 'hosts'
+    hosts.write_text('')
+    resolver = ReverseResolver(nameserver=None, timeout=0.1, hosts_path=str(hosts), fallback_workers=2)
+    # tanpa resolv.conf: paksa jalur getnameinfo sistem
+    resolver.nameserver = None
+    try:
+        futures = [resolver.submit(f'192.0.2.{index}') for index in range(1, 7)]
+        assert [future.result(timeout=2) for future in futures] == [None] * 6
+        # hanya 2 lookup yang sampai ke thread, sisanya langsung dianggap timeout
+        assert len(hanging_getnameinfo) == 2
+        assert resolver.get_stats()['timeouts'] == 6
+    finally:
+        resolver.close()
+
+def test_close_cancels_pending_lookups(stub_dns, tmp_path, recwarn):
+
+    hosts = tmp_path / 'hosts'
+    hosts.write_text('')
+    resolver = ReverseResolver(nameserver=stub_dns.address, timeout=5, hosts_path=str(hosts))
+    future = resolver.submit('192.0.2.99')
+    assert resolver.get_stats()['in_flight'] == 1
+
+    resolver.close()
+    assert future.cancelled()
+    assert not [warning for warning in recwarn if 'destroyed' in str(warning.message)]
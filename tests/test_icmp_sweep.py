@@ -0,0 +1,59 @@
+import errno
+import ipaddress
+
+import pytest
+
+import icmp_sweep
+from icmp_sweep import IcmpSweeper, iter_targets
+
+LOOPBACK = ['127.0.0.1', '127.0.0.2', '127.0.0.3']
+
+def test_loopback_range_replies():
+
+    sweeper = IcmpSweeper(timeout=1)
+    results = sweeper.sweep_sync(LOOPBACK)
+
+    assert sorted(results) == LOOPBACK
+    assert all(rtt >= 0 for rtt in results.values())
+
+def test_iter_sweep_matches_async_sweep():
+
+    sweeper = IcmpSweeper(timeout=1)
+    assert sorted(ip for ip, _ in sweeper.iter_sweep(LOOPBACK)) == LOOPBACK
+
+def test_bad_targets_count_as_unreachable():
+
+    # target rusak tidak boleh menghentikan sweep untuk target lain
+    sweeper = IcmpSweeper(timeout=1)
+    results = sweeper.sweep_sync(['127.0.0.1', 'fe80::1%nosuchif', 'not-an-ip', '127.0.0.2'])
+
+    assert sorted(results) == ['127.0.0.1', '127.0.0.2']
+
+def test_socket_error_is_propagated(monkeypatch):
+
+    def fail(self, family=None):
+
+        raise OSError(errno.EMFILE, 'Too many open files')
+
+    monkeypatch.setattr(IcmpSweeper, '_open_socket', fail)
+    with pytest.raises(OSError):
+        IcmpSweeper(timeout=1).sweep_sync(LOOPBACK)
+
+def test_no_permission_falls_back_to_subprocess(monkeypatch):
+
+    def deny(self, family=None):
+
+        raise PermissionError(errno.EPERM, 'Operation not permitted')
+
+    monkeypatch.setattr(IcmpSweeper, '_open_socket', deny)
+    monkeypatch.setattr(icmp_sweep, 'subprocess_ping', lambda ip, timeout: 0.001 if ip != '127.0.0.3' else None)
+    sweeper = IcmpSweeper(timeout=1)
+    results = sweeper.sweep_sync(LOOPBACK)
+
+    assert sweeper.mode == 'subprocess'
+    assert sorted(results) == ['127.0.0.1', '127.0.0.2']
+
+def test_iter_targets_skips_oversized_ipv4_networks():
+
+    networks = [ipaddress.ip_network('10.0.0.0/15'), ipaddress.ip_network('192.0.2.0/30')]
+    assert list(iter_targets(networks)) == ['192.0.2.1', '192.0.2.2']
@@ -0,0 +1,76 @@
+import urllib.error
+import urllib.request
+
+import pytest
+
+from metrics_exporter import MetricsExporter, OPENMETRICS_CONTENT_TYPE, PROMETHEUS_CONTENT_TYPE
+
+def connection_result(by_process):
+
+    return {
+        'by_state': {'ESTABLISHED': sum(by_process.values())},
+        'by_process': by_process,
+        'suspicious': 1,
+        'summary': {'total_connections': 100, 'suspicious_connections': 4},
+    }
+
+@pytest.fixture
+def exporter():
+
+    exporter = MetricsExporter(port=0, max_processes=3).start()
+    yield exporter
+    exporter.stop()
+
+def scrape(url, accept=None):
+
+    request = urllib.request.Request(url, headers={'Accept': accept} if accept else {})
+    with urllib.request.urlopen(request, timeout=5) as response:
+        return response.headers['Content-Type'], response.read().decode()
+
+def test_scrape_content_types(exporter):
+
+    assert exporter.url.startswith('http://127.0.0.1:')
+    exporter.observe('connections', connection_result({'sshd': 2}))
+
+    content_type, body = scrape(exporter.url)
+    assert content_type == PROMETHEUS_CONTENT_TYPE
+    assert 'monitor_connections{state="ESTABLISHED"} 2' in body
+    assert '# TYPE monitor_connections_recorded gauge' in body
+    assert 'monitor_connections_recorded 100' in body
+    assert not body.endswith('# EOF\n')
+
+    content_type, body = scrape(exporter.url, 'application/openmetrics-text; version=1.0.0,text/plain;q=0.5')
+    assert content_type == OPENMETRICS_CONTENT_TYPE
+    assert body.endswith('# EOF\n')
+    assert exporter.registry.stats['scrapes'] == 2
+
+    with pytest.raises(urllib.error.HTTPError) as error:
+        scrape(exporter.url.replace('/metrics', '/other'))
+    assert error.value.code == 404
+
+def test_cardinality_cap_folds_into_other(exporter):
+
+    processes = {'a': 50, 'b': 40, 'c': 3, 'd': 2, 'e': 1}
+    exporter.observe('connections', connection_result(processes))
+    _, body = scrape(exporter.url)
+
+    series = [line for line in body.splitlines() if line.startswith('monitor_connections_by_process{')]
+    assert series == [
+        'monitor_connections_by_process{process="a"} 50',
+        'monitor_connections_by_process{process="b"} 40',
+        'monitor_connections_by_process{process="other"} 6',
+    ]
+
+def test_capped_counter_stays_monotonic(exporter):
+
+    family = exporter.registry.family('test_events', 'counter', 'Test events', ['source'], 3)
+    exporter.registry.set('test_events', {('a',): 5, ('b',): 1, ('c',): 3, ('d',): 2})
+    assert family.samples == {('a',): 5, ('c',): 3, ('other',): 3}
+
+    # "d" naik melewati "c" dan "b" hilang: anggota tetap sama, "other" tidak turun
+    exporter.registry.set('test_events', {('a',): 6, ('c',): 3, ('d',): 9})
+    assert family.samples == {('a',): 6, ('c',): 3, ('other',): 10}
+
+    exporter.registry.render()
+    _, body = scrape(exporter.url)
+    assert 'test_events_total{source="other"} 10' in body
@@ -0,0 +1,106 @@
+import asyncio
+import threading
+import time
+
+from monitor_daemon import Collector, MonitorDaemon
+
+def run_daemon(collectors, duration=0.6, **kwargs):
+
+    daemon = MonitorDaemon(collectors, drain_timeout=1, **kwargs)
+    asyncio.run(daemon.run(duration))
+    return daemon.get_stats()
+
+def test_hanging_collector_times_out_and_restarts():
+
+    release = threading.Event()
+    torn_down = []
+
+    def hang(context):
+
+        release.wait(0.3)
+        return context
+
+    collector = Collector('hang', hang, setup=lambda: 'ctx', teardown=torn_down.append, interval=0.05,
+                          jitter=0, timeout=0.05, max_failures=1, restart_backoff=0.01)
+    try:
+        stats = run_daemon([collector])
+    finally:
+        release.set()
+
+    assert stats['hang']['timeouts'] >= 1
+    assert stats['hang']['failures'] == stats['hang']['timeouts']
+    assert stats['hang']['runs'] == 0
+    assert stats['hang']['restarts'] >= 1
+    # teardown baru dipanggil setelah run yang macet selesai
+    assert torn_down and set(torn_down) == {'ctx'}
+    assert not stats['hang']['busy']
+
+def test_raising_collector_restarts_without_touching_others():
+
+    setups = []
+    results = []
+
+    def setup():
+
+        setups.append(time.monotonic())
+        return 'ctx'
+
+    def broken(context):
+
+        raise RuntimeError('rusak')
+
+    failing = Collector('broken', broken, setup=setup, interval=0.02, jitter=0, max_failures=2,
+                        restart_backoff=0.05)
+    healthy = Collector('healthy', lambda: 'ok', interval=0.02, jitter=0)
+    daemon = MonitorDaemon([failing, healthy], drain_timeout=1)
+    daemon.add_listener(lambda name, result: results.append((name, result)))
+    asyncio.run(daemon.run(0.5))
+    stats = daemon.get_stats()
+
+    assert stats['broken']['runs'] == 0
+    assert stats['broken']['failures'] >= 2
+    assert stats['broken']['restarts'] >= 1
+    assert stats['broken']['last_error'] == 'RuntimeError: rusak'
+    # tiap restart memanggil setup lagi
+    assert len(setups) >= stats['broken']['restarts']
+    assert stats['healthy']['failures'] == 0
+    assert stats['healthy']['runs'] >= 5
+    assert ('healthy', 'ok') in results
+    assert all(name == 'healthy' for name, _ in results)
+
+def test_overrun_policies():
+
+    def slow():
+
+        time.sleep(0.12)
+        return 'done'
+
+    skip = Collector('skip', slow, interval=0.03, jitter=0, overrun='skip')
+    queue = Collector('queue', slow, interval=0.03, jitter=0, overrun='queue')
+    stats = run_daemon([skip, queue])
+
+    assert stats['skip']['runs'] >= 1
+    assert stats['skip']['overruns'] >= 1
+    assert stats['skip']['skipped'] == stats['skip']['overruns']
+    assert stats['skip']['queued'] == 0
+    assert stats['queue']['queued'] >= 1
+    # queue hanya menyimpan satu run tertunda, sisanya tetap dilewati
+    assert stats['queue']['overruns'] == stats['queue']['queued'] + stats['queue']['skipped']
+    assert stats['queue']['runs'] >= stats['skip']['runs']
+
+def test_drain_waits_for_running_collector_before_teardown():
+
+    events = []
+
+    def run(context):
+
+        time.sleep(0.3)
+        events.append('run')
+
+    collector = Collector('slow', run, setup=lambda: 'ctx', teardown=lambda context: events.append('teardown'),
+                          interval=10, jitter=0)
+    stats = run_daemon([collector], duration=0.1)
+
+    assert events == ['run', 'teardown']
+    assert stats['slow']['runs'] == 1
+    assert not stats['slow']['busy']
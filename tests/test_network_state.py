@@ -0,0 +1,29 @@
+import socket
+
+import pytest
+
+from network_state import NetworkStateService
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_NETLINK'), reason='butuh netlink Linux')
+
+class FailingBindSocket:
+    instances = []
+
+    def __init__(self, *args):
+
+        self.closed = False
+        FailingBindSocket.instances.append(self)
+
+    def bind(self, address):
+
+        raise PermissionError('bind ditolak')
+
+    def close(self):
+
+        self.closed = True
+
+def test_netlink_bind_failure_closes_socket(monkeypatch):
+
+    monkeypatch.setattr(socket, 'socket', FailingBindSocket)
+    assert NetworkStateService()._open_netlink() is None
+    assert [sock.closed for sock in FailingBindSocket.instances] == [True]
@@ -0,0 +1,50 @@
+import os
+import socket
+
+import pytest
+
+psutil = pytest.importorskip('psutil')
+
+from proc_file import ProcFile
+
+pytestmark = pytest.mark.skipif(not os.path.exists('/proc/net/tcp'), reason='butuh /proc Linux')
+
+@pytest.fixture
+def listeners():
+
+    # 200 socket LISTEN membuat /proc/net/tcp jauh lebih besar dari satu halaman
+    sockets = []
+    for _ in range(200):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.listen()
+        sockets.append(sock)
+    yield sockets
+    for sock in sockets:
+        sock.close()
+
+def test_read_returns_whole_multi_page_file(listeners):
+
+    proc_file = ProcFile('/proc/net/tcp', size=4096)
+    try:
+        with open('/proc/net/tcp', 'rb') as f:
+            expected = f.read()
+        assert len(expected) > 4096
+        # dibaca dua kali: fd dan buffer dipakai ulang
+        for _ in range(2):
+            assert proc_file.read().tobytes().count(b'\n') == expected.count(b'\n')
+    finally:
+        proc_file.close()
+
+def test_proc_connections_match_psutil(listeners, connection_monitor):
+
+    ports = {sock.getsockname()[1] for sock in listeners}
+    backend = connection_monitor.ProcNetConnections(resolve_pids=False)
+    try:
+        found = {conn.laddr.port for conn in backend.net_connections() if conn.status == 'LISTEN'}
+    finally:
+        backend.close()
+    expected = {conn.laddr.port for conn in psutil.net_connections('tcp') if conn.status == 'LISTEN'}
+
+    assert ports <= found
+    assert ports <= expected
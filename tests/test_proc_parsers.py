@@ -0,0 +1,70 @@
+import os
+import socket
+
+import pytest
+
+# salinan /proc yang dibekukan: net/tcp sengaja lebih besar dari satu halaman (4096 byte)
+PROC_FIXTURE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'proc')
+
+@pytest.fixture
+def collector(local_monitor):
+
+    collector = local_monitor.LinuxProcCollector(proc_root=PROC_FIXTURE)
+    yield collector
+    collector.close()
+
+@pytest.fixture
+def proc_connections(connection_monitor):
+
+    backend = connection_monitor.ProcNetConnections(proc_root=PROC_FIXTURE, resolve_pids=False)
+    yield backend
+    backend.close()
+
+def test_fixture_tcp_is_larger_than_a_page():
+
+    assert os.path.getsize(os.path.join(PROC_FIXTURE, 'net', 'tcp')) > 4096
+
+def test_tcp_and_tcp6_rows_are_parsed(proc_connections):
+
+    connections = proc_connections.net_connections()
+    listeners = [conn for conn in connections if conn.status == 'LISTEN' and conn.family == socket.AF_INET]
+
+    assert len(connections) == 43
+    assert sorted(conn.laddr.port for conn in listeners) == list(range(10000, 10040))
+    assert all(conn.laddr.ip == '127.0.0.1' and conn.raddr == () for conn in listeners)
+
+    established = [conn for conn in connections if conn.status == 'ESTABLISHED']
+    assert [(conn.laddr, conn.raddr) for conn in established] == [
+        (('192.0.2.2', 50022), ('203.0.113.5', 443))
+    ]
+    assert [conn.status for conn in connections if conn.status not in ('LISTEN', 'ESTABLISHED')] == ['TIME_WAIT']
+
+    ipv6 = [conn for conn in connections if conn.family == socket.AF_INET6]
+    assert [(conn.laddr.ip, conn.laddr.port, conn.status) for conn in ipv6] == [('::1', 8080, 'LISTEN')]
+
+def test_cpu_times_from_stat(collector):
+
+    total = collector.cpu_times()
+    cores = collector.cpu_times(percpu=True)
+
+    assert (total.user, total.system, total.idle, total.softirq) == (1000, 500, 8000, 50)
+    assert [core.user for core in cores] == [600, 400]
+    assert collector.cpu_count() == 2
+
+def test_virtual_memory_from_meminfo(collector):
+
+    memory = collector.virtual_memory()
+
+    assert memory.total == 8000000 * 1024
+    assert memory.available == 6000000 * 1024
+    assert memory.used == 2000000 * 1024
+    assert memory.free == 1000000 * 1024
+    assert memory.percent == 25.0
+
+def test_net_io_counters_from_net_dev(collector):
+
+    # semua interface dijumlah, termasuk lo (sama dengan psutil.net_io_counters())
+    io = collector.net_io_counters()
+
+    assert (io.bytes_recv, io.bytes_sent) == (1005000, 205000)
+    assert (io.packets_recv, io.packets_sent) == (1050, 550)
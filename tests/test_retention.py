@@ -0,0 +1,42 @@
+import logging
+
+logger = logging.getLogger('test')
+
+def connection_row(port, timestamp, process='curl', suspicious=0):
+
+    return (timestamp, '192.0.2.2', port, '203.0.113.5', 443, 'ESTABLISHED', process, 42, suspicious,
+            'opened', timestamp, timestamp)
+
+def test_rebuild_keeps_totals_after_hour_rollups_expire(connection_monitor, tmp_path):
+
+    db_path = str(tmp_path / 'connections.db')
+    conn = connection_monitor.open_database(db_path)
+    assert connection_monitor.migrate_database(conn) == 7
+    conn.close()
+
+    summary = connection_monitor.ConnectionSummary()
+    writer = connection_monitor.ConnectionWriter(db_path, logger, summary=summary)
+    # dua jam lama yang nanti kadaluarsa, satu baris baru yang tetap mentah
+    for port in range(50000, 50004):
+        writer.add(connection_row(port, 3600))
+    writer.add(connection_row(50004, 7200, process='nc', suspicious=1))
+    writer.add(connection_row(50005, 100000, process='nc', suspicious=1))
+    writer.flush()
+    before = summary.snapshot()
+    assert (before['total_connections'], before['suspicious_connections']) == (6, 2)
+
+    manager = connection_monitor.RetentionManager(db_path, logger, raw_retention=3600, minute_retention=3600,
+                                                  hour_retention=3600, chunk_size=1)
+    manager.run_once(now=100000)
+    assert manager.conn.execute('SELECT COUNT(*) FROM conn_rollup_hour WHERE bucket < 96400').fetchone()[0] == 0
+
+    rebuilt = connection_monitor.ConnectionSummary()
+    rebuilt.rebuild(writer.conn)
+    assert rebuilt.snapshot() == before
+    # retensi berikutnya tidak menghitung ulang baris yang sudah dipindah
+    manager.run_once(now=100000)
+    rebuilt.rebuild(writer.conn)
+    assert rebuilt.snapshot() == before
+
+    manager.stop()
+    writer.close()
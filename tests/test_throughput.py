@@ -0,0 +1,110 @@
+import types
+
+import pytest
+
+import throughput
+from throughput import ActiveThroughputTest, PassiveThroughputMonitor, ThroughputServer
+
+NET_DEV_HEADER = (
+    'Inter-|   Receive                                                |  Transmit\n'
+    ' face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets errs drop fifo colls carrier compressed\n'
+)
+
+@pytest.fixture
+def server():
+
+    server = ThroughputServer('127.0.0.1', 0).start()
+    yield server
+    server.stop()
+
+def test_active_test_against_local_server(server):
+
+    host, port = server.address
+    result = ActiveThroughputTest(host, port, streams=2, duration=0.6, warmup=0.2, ping_count=5).run()
+
+    assert result['download_mbps'] > 0
+    assert result['upload_mbps'] > 0
+    assert result['rtt_ms'] is not None and result['rtt_ms'] >= 0
+    assert result['failed_streams'] == {'download': 0, 'upload': 0}
+    assert result['errors'] == []
+
+def test_upload_counts_only_bytes_after_warmup(server):
+
+    host, port = server.address
+    test = ActiveThroughputTest(host, port, streams=2, duration=0.6, warmup=0.2)
+    uploaded, failed = test._run_parallel(test._upload_stream)
+
+    assert failed == []
+    for counted, window in uploaded:
+        assert counted > 0
+        # jendela ukur server = durasi tanpa warm-up (plus sisa data di jalan)
+        assert 0.3 <= window <= 0.6
+
+class FlakyUploadTest(ActiveThroughputTest):
+    def _upload_stream(self, results, index):
+
+        if index == 0:
+            raise ConnectionResetError('stream putus')
+        super()._upload_stream(results, index)
+
+def test_failed_streams_are_reported_not_zeroed(server):
+
+    host, port = server.address
+    result = FlakyUploadTest(host, port, streams=2, duration=0.4, warmup=0.1).run()
+
+    assert result['failed_streams'] == {'download': 0, 'upload': 1}
+    assert result['errors'] == ['stream 0: stream putus']
+    # laju dihitung dari stream yang selesai saja
+    assert result['upload_mbps'] > 0
+
+def write_net_dev(path, counters):
+
+    # counters: {iface: (rx_bytes, tx_bytes, rx_packets, tx_packets)}
+    lines = [
+        f'{name:>6}: {rx} {rx_packets} 0 0 0 0 0 0 {tx} {tx_packets} 0 0 0 0 0 0\n'
+        for name, (rx, tx, rx_packets, tx_packets) in counters.items()
+    ]
+    path.write_text(NET_DEV_HEADER + ''.join(lines))
+
+@pytest.fixture
+def proc_root(tmp_path, monkeypatch):
+
+    (tmp_path / 'net').mkdir()
+    clock = [100.0]
+    monkeypatch.setattr(throughput, 'time', types.SimpleNamespace(monotonic=lambda: clock[0]))
+    return tmp_path, clock
+
+def test_passive_rates_from_counter_deltas(proc_root):
+
+    root, clock = proc_root
+    net_dev = root / 'net' / 'dev'
+    monitor = PassiveThroughputMonitor(proc_root=str(root))
+
+    write_net_dev(net_dev, {'eth0': (1000, 500, 10, 5), 'wlan0': (0, 0, 0, 0)})
+    assert monitor.sample() == {}
+
+    clock[0] += 2
+    write_net_dev(net_dev, {'eth0': (251000, 125500, 210, 105), 'wlan0': (10, 10, 1, 1)})
+    rates = monitor.sample()
+    assert rates['eth0'] == {'rx_mbps': 1.0, 'tx_mbps': 0.5, 'rx_pps': 100.0, 'tx_pps': 50.0}
+
+def test_passive_skips_wrapped_counter_and_missing_interface(proc_root):
+
+    root, clock = proc_root
+    net_dev = root / 'net' / 'dev'
+    monitor = PassiveThroughputMonitor(proc_root=str(root))
+    write_net_dev(net_dev, {'eth0': (2 ** 32 - 100, 5000, 10, 5), 'wlan0': (1000, 1000, 10, 10)})
+    monitor.sample()
+
+    # eth0 wrap / interface naik ulang, wlan0 hilang
+    clock[0] += 1
+    write_net_dev(net_dev, {'eth0': (400, 5000, 12, 5)})
+    assert monitor.sample() == {}
+    assert monitor.rates('wlan0') == {}
+
+    # sampel berikutnya kembali normal dari counter baru
+    clock[0] += 1
+    write_net_dev(net_dev, {'eth0': (125400, 5000, 22, 5), 'wlan0': (0, 0, 0, 0)})
+    rates = monitor.sample()
+    assert rates['eth0']['rx_mbps'] == 1.0
+    assert 'wlan0' not in rates